@@ -1,11 +1,19 @@
 
 import numpy as np
 
-from math import floor, log
+from math import ceil, e, floor, log, pi
 
+from ProbDistr import ProbDistr
 from FiniteDiscrete import FiniteDiscrete
+from auxs import get_rng, binom_logpmf, memoized_stat, memoized_moment
 
-class Binomial: 
+# Above this variance the entropy is given by its asymptotic expansion
+ASYMPTOTIC_VAR = 1e5
+
+# Standard deviations around the mean beyond which probabilities are negligible, for the entropy and the finite representation
+ENTROPY_WINDOW = 40
+
+class Binomial(ProbDistr): 
 	"""
 	Class to deal with Binomial distributions. 
 	"""
@@ -38,15 +46,29 @@ class Binomial:
 		self.n = n
 		self.p = p
 
-		# Creates support set as the set of all natural numbers
-		self.support = np.array([*range(n+1)])
-
 		# Creates the prob function 
 		self.probs = self.get_prob_function()
 
-		# Creates the PDF as a FiniteDiscrete one
-		self.finite_discrete = self.get_finite_discrete()
+		# Support array and FiniteDiscrete representation, only built when needed
+		self._support, self._finite_discrete = None, None
 
+	@property
+	def support(self): 
+		"""
+		Array with the values 0, ..., n of the support. Built on first access. 
+		"""
+		if self._support is None: 
+			self._support = np.arange(self.n + 1)
+		return self._support
+
+	@property
+	def finite_discrete(self): 
+		"""
+		FiniteDiscrete object representing the distribution. Built on first access. See Binomial.get_finite_discrete. 
+		"""
+		if self._finite_discrete is None: 
+			self._finite_discrete = self.get_finite_discrete()
+		return self._finite_discrete
 
 	def get_prob_function(self):
 		"""
@@ -60,26 +82,94 @@ class Binomial:
 		"""
 
 		def PDF(k): 
-			# If function is not in the support, its probability is 0
-			if k not in self.support: return 0.0
+			return float(self.pmf(k))
+
+		return PDF
+
+	def __getstate__(self): 
+		"""
+		Pickles the object without self.probs, a local function that can not be pickled, so it can be sent to worker processes. 
+		"""
+		state = self.__dict__.copy()
+		del state["probs"]
+		return state
+
+	def __setstate__(self, state): 
+		"""
+		Restores a pickled object, rebuilding self.probs. 
+		"""
+		self.__dict__.update(state)
+		self.probs = self.get_prob_function()
+
+	def logpmf(self, k): 
+		"""
+		Computes the logarithm of the probability of every value in k, in a single vectorized pass. 
+		Uses the saddle point form of auxs.special.binom_logpmf, so the cost does not depend on n, and it keeps full precision for large n. 
+
+		Arguments
+		------------
+		k: int or array-like
+			Values to evaluate. Values outside the support get -inf. 
 
-			# Computing the binnomial coeffiicent trying yo avoid the factorial terms
-			bin_coef = 1.0
-			if k <= self.n / 2:
-				for i in range(k): 
-					bin_coef *= (self.n - i) / (i + 1)
-			else:
-				for i in range(self.n - k): 
-					bin_coef *= (self.n - i) / (i + 1)
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as k
+		
+		"""
+		k = np.asarray(k, dtype = float)
 
-			return bin_coef * (self.p ** k) * (1 - self.p) ** (self.n - k)
+		# Values outside the support are evaluated at 0, and masked at the end
+		in_supp = (k >= 0) & (k <= self.n) & (k == np.floor(k))
+		k_supp = np.where(in_supp, k, 0.)
 
+		return np.where(in_supp, binom_logpmf(k_supp, self.n, self.p), -np.inf)[()]
 
-		return PDF
+	def pmf(self, k): 
+		"""
+		Computes the probability of every value in k, in a single vectorized pass. 
+
+		Arguments
+		------------
+		k: int or array-like
+			Values to evaluate. Values outside the support get 0. 
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as k
+		
+		"""
+		return np.exp(self.logpmf(k))
+
+	def to_finite(self): 
+		"""
+		Gets the FiniteDiscrete representing the distribution. See Binomial.finite_discrete. 
+
+		Returns
+		------------
+		FiniteDiscrete
+		
+		"""
+		return self.finite_discrete
+
+	def get_window(self): 
+		"""
+		Gets the values within ENTROPY_WINDOW standard deviations of the mean, outside which probabilities are below machine precision. 
+
+		Returns
+		------------
+		tuple(int, int)
+			The first and last values of the window. 
+		
+		"""
+		width = ENTROPY_WINDOW * ((self.n * self.p * (1 - self.p))**0.5 + 1)
+		return max(0, floor(self.get_mean() - width)), min(self.n, ceil(self.get_mean() + width))
 
 	def get_finite_discrete(self): 
 		"""
-		Creates self.finite_discrete PDF object that represents the entire distribution. 
+		Creates self.finite_discrete PDF object that represents the distribution, over the values given by get_window, in O(min(n, sqrt(npq))). 
+		Uses inverse transform sampling, so no sampler is built: samples come from Binomial.get_samples. 
 
 		Returns
 		------------
@@ -87,7 +177,9 @@ class Binomial:
 			The self.finite_discrete object representing the distribution. 
 		
 		"""
-		return FiniteDiscrete({val: self.probs(val) for val in [*self.support]})
+		lo, hi = self.get_window()
+		support = np.arange(lo, hi + 1)
+		return FiniteDiscrete.from_arrays(support, self.pmf(support), sampler = "inverse")
 
 	def get_mean(self):
 		"""
@@ -146,15 +238,16 @@ class Binomial:
 		"""
 		return floor(self.get_mean() + self.p)
 
+	@memoized_moment
 	def get_moment(self, n, c = 0): 
 		"""
 		Computes the n-th moment of the distr, centered on c. 
+		Sums over the values given by get_window, in O(min(n, sqrt(npq))), as the rest of the support has a negligible probability. 
 
 		Arguments
 		------------
 		n: int
 			The moment to calculate. Has to be a positive integer. 
-			Only n = 0,1,2 are allowed for now
 		c: float
 			The center of the calculation. Default value of 0. 
 
@@ -163,33 +256,59 @@ class Binomial:
 		float
 		
 		"""
+		lo, hi = self.get_window()
+		values = np.arange(lo, hi + 1, dtype = float)
+		return float(self.pmf(values) @ (values - c) ** n)
 
-		return sum([self.probs(val) * (val - c) ** n for val in [*self.support]])
-
+	@memoized_stat
 	def get_entropy(self):
 		"""
 		Computes the entropy of the distr. 
-		Returns None, as no closed form is known. 
+		For n * p * (1-p) >= ASYMPTOTIC_VAR uses the expansion 1/2 log(2 pi e npq) - (1 - 4pq) / (12 npq), whose error is O((npq)^-2), below 1e-11. 
+		Otherwise sums -p log p with a vectorized logpmf over the values within ENTROPY_WINDOW standard deviations of the mean, 
+		in O(min(n, sqrt(npq))), as the rest of the support adds less than machine precision. 
 
 		Returns
 		------------
 		float
 		
 		"""
-		return - sum([self.probs(val) * log(self.probs(val)) for val in [*self.support]])
+		pq = self.p * (1 - self.p)
+		var = self.n * pq
+
+		if var == 0: 
+			return 0.
+		if var >= ASYMPTOTIC_VAR: 
+			return 0.5 * log(2 * pi * e * var) - (1 - 4 * pq) / (12 * var)
+
+		lo, hi = self.get_window()
+
+		# Normalizing cancels any rounding error shared by every value
+		log_probs = self.logpmf(np.arange(lo, hi + 1))
+		log_probs -= log(np.exp(log_probs).sum())
+		probs = np.exp(log_probs)
+
+		# Probabilities that underflow to 0 add nothing, instead of 0 * -inf
+		return float(- probs @ np.where(probs > 0, log_probs, 0.))
 
-	def get_samples(self, k = 1):
+	def get_samples(self, k = 1, rng = None):
 		"""
-		Generates k samples of the distr. 
+		Generates k samples of the distr, without building any table. 
+		Uses NumPy's Generator.binomial: BTPE (Kachitvichyanukul & Schmeiser, 1988) when n * min(p, 1-p) >= 30, inversion otherwise. 
 
 		Arguments
 		------------
 		k: int >= 0
 			The number of samples to generate. 
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None. 
+		workers: int >= 1 or None
+			If given, samples are drawn by this many processes, each with an independent stream, writing into shared memory. 
+			Default value of None, for sampling in this process. 
 
 		Returns
 		------------
-		list[floats]
+		np.ndarray[int]
 		
 		"""
 		if not isinstance(k, int): 
@@ -197,7 +316,7 @@ class Binomial:
 
 		assert k >= 0, "k parameter can not be negative"
 
-		return self.finite_discrete.get_samples(k)
+		return get_rng(rng).binomial(self.n, self.p, size = k)
 
 
 
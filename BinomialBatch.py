@@ -0,0 +1,190 @@
+
+import numpy as np
+
+from Binomial import Binomial
+from auxs.sampling import DEFAULT_CHUNK_SIZE, iter_sample_chunks
+from auxs import parallelized, get_rng, binom_logpmf
+
+class BinomialBatch: 
+	"""
+	Class to deal with many Binomial distributions at once, one per pair of (n, p) parameters. 
+	Every method broadcasts over the parameter arrays, replacing a Python loop over Binomial objects. 
+	As results have the broadcast shape of the arguments and the parameters, it is not a ProbDistr, and has no cdf, ppf or sum. Index it to get Binomial objects. 
+	"""
+
+	def __init__(self, n, p): 
+		"""
+		Generates the basic object. 
+
+		Arguments
+		------------
+		n: int or array-like of ints
+			Sizes of the distributions
+		p: float or array-like of floats
+			Probabilities of success for each realization. Broadcasted against n. 
+		
+		"""
+
+		n, p = np.broadcast_arrays(np.asarray(n), np.asarray(p, dtype = float))
+
+		# Check n has integer values
+		if not (np.issubdtype(n.dtype, np.integer) or (np.issubdtype(n.dtype, np.floating) and (n == np.floor(n)).all())): 
+			raise TypeError("N parameters have to be int")
+
+		# Check n >= 0, and p is greater >= 0 and <= 1
+		assert (n >= 0).all(), "N parameters can not be negative"
+		assert ((p >= 0) & (p <= 1)).all(), "p parameters have to be between 0 and 1"
+
+		# Assign n and p, as read only arrays
+		self.n = n.astype(np.int64)
+		self.p = p.copy()
+		self.n.flags.writeable = False
+		self.p.flags.writeable = False
+
+	@property
+	def shape(self): 
+		return self.n.shape
+
+	def __len__(self): return len(self.n)
+
+	def __getitem__(self, idx): 
+		"""
+		Gets the distributions at idx: a Binomial object for a single one, a BinomialBatch otherwise. 
+		"""
+		n, p = self.n[idx], self.p[idx]
+		if np.ndim(n) == 0: 
+			return Binomial(int(n), float(p))
+		return BinomialBatch(n, p)
+
+	def logpmf(self, k): 
+		"""
+		Computes the logarithm of the probability of k under every distribution. 
+
+		Arguments
+		------------
+		k: int or array-like
+			Values to evaluate, broadcasted against the parameters. Values outside the support get -inf. 
+
+		Returns
+		------------
+		np.ndarray
+			Broadcasted shape of k and the parameters
+		
+		"""
+		k = np.asarray(k, dtype = float)
+
+		# Values outside the support are evaluated at 0, and masked at the end
+		in_supp = (k >= 0) & (k <= self.n) & (k == np.floor(k))
+		k_supp = np.where(in_supp, k, 0.)
+
+		return np.where(in_supp, binom_logpmf(k_supp, self.n, self.p), -np.inf)
+
+	def pmf(self, k): 
+		"""
+		Computes the probability of k under every distribution. 
+
+		Arguments
+		------------
+		k: int or array-like
+			Values to evaluate, broadcasted against the parameters. Values outside the support get 0. 
+
+		Returns
+		------------
+		np.ndarray
+			Broadcasted shape of k and the parameters
+		
+		"""
+		return np.exp(self.logpmf(k))
+
+	def get_mean(self): 
+		"""
+		Computes the unconditional mean of every distr. 
+
+		Returns
+		------------
+		np.ndarray
+		
+		"""
+		return self.n * self.p
+
+	def get_std(self): 
+		"""
+		Computes the standard deviation of every distr. 
+
+		Returns
+		------------
+		np.ndarray
+		
+		"""
+		return self.get_var()**0.5
+
+	def get_var(self): 
+		"""
+		Computes the variance of every distr. 
+
+		Returns
+		------------
+		np.ndarray
+		
+		"""
+		return self.get_mean() * (1 - self.p)
+
+	def get_mode(self): 
+		"""
+		Computes the mode of every distr. 
+
+		Returns
+		------------
+		np.ndarray
+		
+		"""
+		return np.floor((self.n + 1) * self.p).astype(np.int64) - (self.p == 1)
+
+	@parallelized
+	def get_samples(self, k = 1, rng = None): 
+		"""
+		Generates k samples of every distr, in a single vectorized draw. 
+
+		Arguments
+		------------
+		k: int >= 0
+			The number of samples to generate for each distr. 
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None. 
+		workers: int >= 1 or None
+			If given, samples are drawn by this many processes, each with an independent stream, writing into shared memory. 
+			Default value of None, for sampling in this process. 
+
+		Returns
+		------------
+		np.ndarray[int]
+			Of shape (k, *self.shape)
+		
+		"""
+		if not isinstance(k, int): 
+			raise TypeError("k parameter has to be int")
+
+		assert k >= 0, "k parameter can not be negative"
+
+		return get_rng(rng).binomial(self.n, self.p, size = (k,) + self.shape)
+
+	def iter_samples(self, k = None, chunk_size = DEFAULT_CHUNK_SIZE, rng = None): 
+		"""
+		Lazily generates samples of every distr in fixed size chunks, using constant memory. 
+
+		Arguments
+		------------
+		k: int >= 0 or None
+			Total number of samples of each distr. Default value of None, for an endless stream. 
+		chunk_size: int >= 1
+			Number of samples of each distr per chunk. The last chunk may be shorter. 
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None. 
+
+		Returns
+		------------
+		generator of np.ndarray
+			Chunks of shape (size, *self.shape)
+		
+		"""
+		return iter_sample_chunks(self.get_samples, k, chunk_size, rng)
@@ -1,8 +1,11 @@
 
 import numpy as np
 
+from ProbDistr import ProbDistr
+from FiniteDiscrete import FiniteDiscrete
 
-class Deterministic: 
+
+class Deterministic(ProbDistr): 
 	"""
 	Class to deal with deterministic distributions. 
 	"""
@@ -20,11 +23,61 @@ class Deterministic:
 
 		self.value = value
 
+		# FiniteDiscrete representation, only built when needed
+		self._finite = None
+
 	@property
 	def support(self):
 		return {self.value}
 	
 
+	def pmf(self, k): 
+		"""
+		Computes the probability of every value in k: 1 for the value of the random variable, 0 otherwise. 
+
+		Arguments
+		------------
+		k: float or array-like
+			Values to evaluate. 
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as k
+		
+		"""
+		return (np.asarray(k) == self.value).astype(float)[()]
+
+	def cdf(self, x): 
+		"""
+		Computes the cumulative probability P(X <= x) of every value in x. 
+
+		Arguments
+		------------
+		x: float or array-like
+			Values to evaluate. 
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as x
+		
+		"""
+		return (np.asarray(x) >= self.value).astype(float)[()]
+
+	def to_finite(self): 
+		"""
+		Gets a FiniteDiscrete with the value of the random variable as its only atom. Built on first use, without a sampler. 
+
+		Returns
+		------------
+		FiniteDiscrete
+		
+		"""
+		if self._finite is None: 
+			self._finite = FiniteDiscrete([self.value], sampler = "inverse")
+		return self._finite
+
 	def get_mean(self):
 		"""
 		Computes the unconditional mean of the distr. 
@@ -109,7 +162,7 @@ class Deterministic:
 		"""
 		return 0
 
-	def get_samples(self, k = 1):
+	def get_samples(self, k = 1, rng = None):
 		"""
 		Generates k samples of the distr. 
 
@@ -117,6 +170,11 @@ class Deterministic:
 		------------
 		k: int >= 0
 			The number of samples to generate. 
+		rng: np.random.Generator, int or None
+			Accepted for consistency with the other distributions, no randomness is needed. 
+		workers: int >= 1 or None
+			If given, samples are drawn by this many processes, each with an independent stream, writing into shared memory. 
+			Default value of None, for sampling in this process. 
 
 		Returns
 		------------
@@ -0,0 +1,277 @@
+
+import numpy as np
+
+from collections import Counter
+
+from ProbDistr import ProbDistr
+from FiniteDiscrete import FiniteDiscrete
+from auxs import FenwickTree, get_rng, memoized_stat, memoized_moment, clear_memoized
+
+class DynamicFiniteDiscrete(ProbDistr): 
+	"""
+	Class to deal with finite discrete distributions whose weights change over time.
+	Weights live in a Fenwick tree, so adding, removing or reweighting a value and drawing a sample cost O(log n).
+	"""
+
+	def __init__(self, values = None): 
+		"""
+		Generates the basic object.
+
+		Arguments
+		------------
+		values: list, dict or None
+			If list, the elements are the support, and the distributions is assumed to be uniform. Repeated elements add up their weights.
+			If dict, the keys are the values in the support, each one pointing to its (proportional) weight
+			If None, the distribution starts empty, and values have to be added before sampling.
+		
+		"""
+
+		# Check if values is either list, dict or None
+		if values is None:
+			values = dict()
+		elif isinstance(values, list):
+			# Repeated values add up their weights, as in FiniteDiscrete
+			values = dict(Counter(float(val) for val in values))
+		elif not isinstance(values, dict):
+			raise TypeError("DynamicFiniteDiscrete values argument should be a list, a dict or None")
+
+		# Check weights are non negative
+		assert all(w >= 0 for w in values.values()), "Weights must be non-negative"
+
+		# Omit values with weight == 0, they are not part of the support
+		values = {float(val): float(w) for val, w in values.items() if w > 0}
+
+		# Slot of each value in the tree, value of each slot (nan if free), and slots left free by removals
+		self.slots = {val: i for i, val in enumerate(values)}
+		self.slot_values = np.fromiter(values.keys(), dtype = float, count = len(values))
+		self.free_slots = []
+
+		self.tree = FenwickTree(np.fromiter(values.values(), dtype = float, count = len(values)))
+
+	def __len__(self): return len(self.slots)
+
+	def __contains__(self, value): return float(value) in self.slots
+
+	def add(self, value, weight): 
+		"""
+		Adds weight to value, inserting it in the support if needed. O(log n) amortized.
+
+		Arguments
+		------------
+		value: float
+		weight: float >= 0
+		
+		"""
+		assert weight >= 0, "Weights must be non-negative"
+
+		value = float(value)
+		if value in self.slots:
+			self.update_weight(value, self.tree.weights[self.slots[value]] + weight)
+			return
+		if weight == 0: return
+
+		# Growing the tree by doubling when there are no free slots left
+		if not self.free_slots:
+			n = len(self.tree)
+			capacity = max(2 * n, 1)
+			self.tree.resize(capacity)
+			self.slot_values = np.concatenate([self.slot_values, np.full(capacity - n, np.nan)])
+			self.free_slots = list(range(capacity - 1, n - 1, -1))
+
+		slot = self.free_slots.pop()
+		self.slots[value] = slot
+		self.slot_values[slot] = value
+		self.tree.set_weight(slot, float(weight))
+		clear_memoized(self)
+
+	def update_weight(self, value, weight): 
+		"""
+		Sets the weight of a value of the support, in O(log n). A weight of 0 removes the value.
+
+		Arguments
+		------------
+		value: float
+		weight: float >= 0
+		
+		"""
+		assert weight >= 0, "Weights must be non-negative"
+
+		value = float(value)
+		if value not in self.slots:
+			raise KeyError(f"{value} is not part of the support")
+		if weight == 0:
+			self.remove(value)
+			return
+
+		self.tree.set_weight(self.slots[value], float(weight))
+		clear_memoized(self)
+
+	def remove(self, value): 
+		"""
+		Removes a value from the support, in O(log n).
+
+		Arguments
+		------------
+		value: float
+		
+		"""
+		value = float(value)
+		if value not in self.slots:
+			raise KeyError(f"{value} is not part of the support")
+
+		slot = self.slots.pop(value)
+		self.slot_values[slot] = np.nan
+		self.tree.set_weight(slot, 0.)
+		self.free_slots.append(slot)
+		clear_memoized(self)
+
+	def get_values_probs(self): 
+		"""
+		Gets the values of the support and their probabilities, in slot order. O(n).
+		Every statistic is computed from them, so they fail on an empty distribution, like get_samples.
+
+		Returns
+		------------
+		tuple(np.ndarray, np.ndarray)
+		
+		"""
+		assert len(self.slots) > 0, "Empty distribution, add values first"
+
+		weights = self.tree.weights
+		used = weights > 0
+		return self.slot_values[used], weights[used] / weights[used].sum()
+
+	def get_finite_discrete(self, sampler = "tree"): 
+		"""
+		Creates a FiniteDiscrete snapshot of the current distribution.
+
+		Arguments
+		------------
+		sampler: str
+			Engine used by the snapshot. See FiniteDiscrete.__init__
+
+		Returns
+		------------
+		FiniteDiscrete
+		
+		"""
+		return FiniteDiscrete.from_arrays(*self.get_values_probs(), sampler = sampler)
+
+	def to_finite(self): 
+		"""
+		Creates a FiniteDiscrete snapshot of the current distribution, with inverse transform sampling so no sampler is built. 
+
+		Returns
+		------------
+		FiniteDiscrete
+		
+		"""
+		return self.get_finite_discrete(sampler = "inverse")
+
+	@memoized_stat
+	def get_mean(self): 
+		"""
+		Computes the unconditional mean of the distr.
+
+		Returns
+		------------
+		float
+		
+		"""
+		values, probs = self.get_values_probs()
+		return float(probs @ values)
+
+	def get_std(self): 
+		"""
+		Computes the standard deviation of the distr.
+
+		Returns
+		------------
+		float
+		
+		"""
+		return self.get_var()**0.5
+
+	@memoized_stat
+	def get_var(self): 
+		"""
+		Computes the variance of the distr.
+
+		Returns
+		------------
+		float
+		
+		"""
+		return self.get_moment(2, c = self.get_mean())
+
+	@memoized_stat
+	def get_mode(self): 
+		"""
+		Computes the mode of the distr.
+
+		Returns
+		------------
+		float
+		
+		"""
+		values, probs = self.get_values_probs()
+		return values[np.argmax(probs)]
+
+	@memoized_moment
+	def get_moment(self, n, c = 0): 
+		"""
+		Computes the n-th moment of the distr, centered on c.
+
+		Arguments
+		------------
+		n: int
+			The moment to calculate. Has to be a positive integer.
+		c: float
+			The center of the calculation. Default value of 0.
+
+		Returns
+		------------
+		float
+		
+		"""
+		values, probs = self.get_values_probs()
+		return float(probs @ (values - c)**n)
+
+	@memoized_stat
+	def get_entropy(self): 
+		"""
+		Computes the entropy of the distr.
+
+		Returns
+		------------
+		float
+		
+		"""
+		_, probs = self.get_values_probs()
+		return float(- probs @ np.log(probs))
+
+	def get_samples(self, k = 1, rng = None, out = None): 
+		"""
+		Generates k samples of the distr, in O(log n) each, with a vectorized descent of the Fenwick tree.
+
+		Arguments
+		------------
+		k: int >= 0
+			The number of samples to generate.
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None.
+		out: np.ndarray or None
+			Preallocated array of length k where the samples are written. Default value of None, for a new array.
+		workers: int >= 1 or None
+			If given, samples are drawn by this many processes, each with an independent stream, writing into shared memory. 
+			Default value of None, for sampling in this process. 
+
+		Returns
+		------------
+		np.ndarray[float]
+		
+		"""
+		assert len(self.slots) > 0, "Can not sample from an empty distribution"
+
+		u = get_rng(rng).random(k) * self.tree.get_total()
+		return np.take(self.slot_values, self.tree.search(u), out = out)
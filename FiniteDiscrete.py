@@ -1,16 +1,24 @@
 
+import json, os
+
 import numpy as np
 
-from math import log
+from ProbDistr import ProbDistr
+from auxs import AliasTable, BinaryTree, get_rng, memoized_stat, memoized_moment
 
-from auxs import BinaryTree
+# Version of the directory layout written by FiniteDiscrete.save
+FORMAT_VERSION = 1
 
-class FiniteDiscrete: 
+class FiniteDiscrete(ProbDistr): 
 	"""
 	Class to deal with finite discrete distributions of arbitrary densities. 
+	The distribution is stored as two sorted, contiguous arrays: self.values and self.probabilities.
 	"""
 
-	def __init__(self, values): 
+	# Bound of the probability mass left out when representing another distribution, set by Poisson.to_finite, and carried through convolve and Mixture.to_finite
+	tail_bound = 0.
+
+	def __init__(self, values, sampler = "tree"): 
 		"""
 		Generates the basic object. 
 
@@ -19,6 +27,12 @@ class FiniteDiscrete:
 		values: list or dict
 			If list, the elements are the support, and the distributions is assumed to be uniform. 
 			If dict, the keys are the values in the support, each one pointing to its (proportional) weight
+		sampler: str
+			Engine used by get_samples. Can be: 
+				- "tree" for the balanced binary tree, O(log n) per sample
+				- "alias" for the Walker/Vose alias table, O(1) per sample
+				- "inverse" for inverse transform sampling over the cumulative table, O(log n) per sample
+				- Default value: "tree"
 		
 		"""
 
@@ -34,45 +48,285 @@ class FiniteDiscrete:
 		else:
 			raise TypeError("FiniteDiscrete values argument should be a list or a dict")
 
+		self.set_distribution(vals, weigs, sampler)
+
+	@classmethod
+	def from_arrays(cls, values, weights, sampler = "tree"): 
+		"""
+		Generates the object straight from arrays, without building a dict.
+
+		Arguments
+		------------
+		values: array-like
+			Possible values in the support
+		weights: array-like
+			The relative weight of each element. Dont have to be normalized. Should be in the same order as values.
+		sampler: str
+			Engine used by get_samples. See FiniteDiscrete.__init__
+
+		Returns
+		------------
+		FiniteDiscrete
+		
+		"""
+		distr = cls.__new__(cls)
+		distr.set_distribution(np.asarray(values, dtype = float).ravel(), np.asarray(weights, dtype = float).ravel(), sampler)
+		return distr
+
+	def set_distribution(self, values, weights, sampler): 
+		"""
+		Validates the values and weights, and creates every attribute of the object.
+
+		Arguments
+		------------
+		values: np.ndarray
+			Possible values in the support
+		weights: np.ndarray
+			The relative weight of each element. Dont have to be normalized. 
+		sampler: str
+			Engine used by get_samples. See FiniteDiscrete.__init__
+		
+		"""
+
+		# Check the sampler is a known one
+		assert sampler in ("tree", "alias", "inverse"), "FiniteDiscrete sampler has to be 'tree', 'alias' or 'inverse'"
+		self.sampler = sampler
+
 		# Check the support is not an empty set
-		assert len(vals) > 0, "Support can not be empty"
+		assert len(values) > 0, "Support can not be empty"
+		assert len(values) == len(weights), "Values and weights must have the same length"
 
 		# Check weights are non negative, and that the sum > 0
-		assert (weigs >= 0).all(), "Weights must be non-negative"
-		assert weigs.sum() > 0, "Weights can not be all 0"
+		assert (weights >= 0).all(), "Weights must be non-negative"
+		assert weights.sum() > 0, "Weights can not be all 0"
 
 		# Omit values with weight == 0, they are not part of the support
-		vals, weigs = vals[weigs>0], weigs[weigs>0]
+		values, weights = values[weights>0], weights[weights>0]
 
-		# Creates support set and probability dictionary
-		self.support, self.probs = self.get_support_probs(vals, weigs)
+		# Creates the sorted values and probabilities arrays
+		self.values, self.probabilities = self.get_values_probs(values, weights)
 
-		# Creates balances binary tree for sampling
-		self.tree_repr = self.get_tree_repr(vals, weigs)
+		# Set and dict views of the distribution, and cumulative probabilities, only built when requested
+		self._support, self._probs, self._cum_probs = None, None, None
 
-	def get_support_probs(self, values, weights):
+		# Creates the sampling engine: balanced binary tree or alias table. Inverse sampling uses self.cum_probs
+		if sampler == "tree": 
+			self.tree_repr = self.get_tree_repr(self.values, self.probabilities)
+		elif sampler == "alias":
+			self.alias_repr = self.get_alias_repr(self.values, self.probabilities)
+
+	def get_values_probs(self, values, weights): 
 		"""
-		Creates self.support, and the self.probs dictionary. 
+		Creates the self.values and self.probabilities arrays.
+		Repeated values are merged, adding up their weights.
 
 		Arguments
 		------------
-		values: list
-			List of possible values in the support
-		weights: list
+		values: np.ndarray
+			Possible values in the support
+		weights: np.ndarray
 			The relative weight of each element. Dont have to be normalized. 
 
 		Returns
 		------------
-		tuple(set, dict)
-			The self.support and self.probs attributes
+		tuple(np.ndarray, np.ndarray)
+			The sorted values, and their normalized probabilities
 		
 		"""
-		supp = set(values)
+		uniq, inverse = np.unique(values, return_inverse = True)
+		weights = np.bincount(inverse.ravel(), weights = weights, minlength = len(uniq))
+		probs = weights / weights.sum()
 
-		total_weight = weights.sum()
-		probs = {v: w / total_weight for (v,w) in zip(values, weights)}
+		# Tiny weights can underflow to 0 once normalized
+		return np.ascontiguousarray(uniq[probs > 0]), np.ascontiguousarray(probs[probs > 0])
 
-		return supp, probs
+	@property
+	def support(self): 
+		"""
+		Set with the values of the support. Built on first access, kept for backwards compatibility.
+		"""
+		if self._support is None:
+			self._support = set(self.values.tolist())
+		return self._support
+
+	@property
+	def probs(self): 
+		"""
+		Dict from each value of the support to its probability. Built on first access, kept for backwards compatibility.
+		"""
+		if self._probs is None:
+			self._probs = dict(zip(self.values.tolist(), self.probabilities.tolist()))
+		return self._probs
+
+	@property
+	def cum_probs(self): 
+		"""
+		Array with the cumulative probability P(X <= v) of each value v in self.values. Built on first access. 
+		"""
+		if self._cum_probs is None: 
+			cum_probs = np.cumsum(self.probabilities)
+			cum_probs[-1] = 1.
+			self._cum_probs = cum_probs
+		return self._cum_probs
+
+	def pmf(self, k): 
+		"""
+		Computes the probability of every value in k, with a binary search over self.values, in O(log n) each. 
+
+		Arguments
+		------------
+		k: float or array-like
+			Values to evaluate. Values outside the support get 0. 
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as k
+		
+		"""
+		k = np.asarray(k, dtype = float)
+		idx = np.minimum(np.searchsorted(self.values, k), len(self.values) - 1)
+		return np.where(self.values[idx] == k, self.probabilities[idx], 0.)[()]
+
+	def to_finite(self): 
+		"""
+		Gets the FiniteDiscrete representing the distribution, which is itself. 
+
+		Returns
+		------------
+		FiniteDiscrete
+		
+		"""
+		return self
+
+	def cdf(self, x): 
+		"""
+		Computes the cumulative probability P(X <= x) of every value in x, in O(log n) each. 
+
+		Arguments
+		------------
+		x: float or array-like
+			Values to evaluate. 
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as x
+		
+		"""
+		idx = np.searchsorted(self.values, x, side = "right")
+		return np.where(idx > 0, self.cum_probs[np.maximum(idx - 1, 0)], 0.)[()]
+
+	def sf(self, x): 
+		"""
+		Computes the survival function P(X > x) of every value in x, in O(log n) each. 
+
+		Arguments
+		------------
+		x: float or array-like
+			Values to evaluate. 
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as x
+		
+		"""
+		return np.maximum(1. - self.cdf(x), 0.)[()]
+
+	def ppf(self, q): 
+		"""
+		Computes the quantile function: the smallest value v with P(X <= v) >= q, for every q. O(log n) each. 
+
+		Arguments
+		------------
+		q: float or array-like
+			Probabilities between 0 and 1. 
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as q
+		
+		"""
+		q = np.asarray(q, dtype = float)
+		assert ((q >= 0) & (q <= 1)).all(), "Quantiles have to be between 0 and 1"
+
+		idx = np.searchsorted(self.cum_probs, q, side = "left")
+		return self.values[np.minimum(idx, len(self.values) - 1)][()]
+
+	def save(self, path): 
+		"""
+		Saves the distribution to the directory path, as one flat .npy file per array, plus a small meta.json. 
+		Stores the support, the probabilities, the cumulative probabilities and the arrays of the sampler, 
+		so loading does not rebuild anything. Plain .npy files are used because .npz archives can not be memory-mapped. 
+
+		Arguments
+		------------
+		path: str
+			Directory to save to. Created if it does not exist. 
+		
+		"""
+		arrays = {"values": self.values, "probabilities": self.probabilities, "cum_probs": self.cum_probs}
+		if self.sampler == "tree": 
+			left, right, split, leaf_values = self.tree_repr.get_flat_arrays()
+			arrays.update(tree_left = left, tree_right = right, tree_split = split, tree_leaf_values = leaf_values)
+		elif self.sampler == "alias": 
+			arrays.update(alias_prob = self.alias_repr.prob, alias_index = self.alias_repr.alias)
+
+		os.makedirs(path, exist_ok = True)
+		for name, array in arrays.items(): 
+			np.save(os.path.join(path, name + ".npy"), np.ascontiguousarray(array))
+		with open(os.path.join(path, "meta.json"), "w") as f: 
+			json.dump({"format_version": FORMAT_VERSION, "sampler": self.sampler}, f)
+
+	@classmethod
+	def load(cls, path, mmap = True): 
+		"""
+		Loads a distribution saved with FiniteDiscrete.save, without rebuilding the sampler. 
+
+		Arguments
+		------------
+		path: str
+			Directory the distribution was saved to. 
+		mmap: bool
+			If True, the arrays are memory-mapped read only instead of copied into memory, 
+			so every process loading the same path shares them through the page cache. 
+			Such objects are pickled as their path, so parallel workers also map the files. Default value of True. 
+
+		Returns
+		------------
+		FiniteDiscrete
+		
+		"""
+		with open(os.path.join(path, "meta.json")) as f: 
+			meta = json.load(f)
+		if meta["format_version"] != FORMAT_VERSION: 
+			raise ValueError(f"Unknown FiniteDiscrete format version {meta['format_version']}")
+
+		def load_array(name): 
+			return np.load(os.path.join(path, name + ".npy"), mmap_mode = "r" if mmap else None)
+
+		distr = cls.__new__(cls)
+		distr.sampler = meta["sampler"]
+		distr.values, distr.probabilities = load_array("values"), load_array("probabilities")
+		distr._support, distr._probs, distr._cum_probs = None, None, load_array("cum_probs")
+		distr._path = os.path.abspath(path) if mmap else None
+
+		if distr.sampler == "tree": 
+			distr.tree_repr = BinaryTree.from_flat(*[load_array("tree_" + name) for name in ("left", "right", "split", "leaf_values")])
+		elif distr.sampler == "alias": 
+			distr.alias_repr = AliasTable.from_tables(distr.values, load_array("alias_prob"), load_array("alias_index"))
+
+		return distr
+
+	def __reduce_ex__(self, protocol): 
+		"""
+		Objects memory-mapped by FiniteDiscrete.load are pickled as their path instead of their arrays. 
+		"""
+		if getattr(self, "_path", None) is not None: 
+			return type(self).load, (self._path, True)
+		return super().__reduce_ex__(protocol)
 
 	def get_tree_repr(self, values, weights): 
 		"""
@@ -80,7 +334,10 @@ class FiniteDiscrete:
 
 		Arguments
 		------------
-		None
+		values: np.ndarray
+			Possible values in the support
+		weights: np.ndarray
+			The relative weight of each element. Dont have to be normalized. 
 
 		Returns
 		------------
@@ -88,8 +345,27 @@ class FiniteDiscrete:
 			The root of the tree. 
 		
 		"""
-		return BinaryTree(list(values), list(weights))
+		return BinaryTree.from_arrays(values.tolist(), weights.tolist())
+
+	def get_alias_repr(self, values, weights): 
+		"""
+		Creates the alias table used to get samples from the distribution in O(1). 
+
+		Arguments
+		------------
+		values: np.ndarray
+			Possible values in the support
+		weights: np.ndarray
+			The relative weight of each element. Dont have to be normalized. 
 
+		Returns
+		------------
+		AliasTable
+		
+		"""
+		return AliasTable(values, weights)
+
+	@memoized_stat
 	def get_mean(self):
 		"""
 		Computes the unconditional mean of the distr. 
@@ -99,7 +375,7 @@ class FiniteDiscrete:
 		float
 		
 		"""
-		return sum([self.probs[val] * val for val in [*self.probs]]) / sum([self.probs[val] for val in [*self.probs]])
+		return float(self.probabilities @ self.values)
 
 	def get_std(self):
 		"""
@@ -112,6 +388,7 @@ class FiniteDiscrete:
 		"""
 		return self.get_var()**0.5
 
+	@memoized_stat
 	def get_var(self):
 		"""
 		Computes the variance of the distr. 
@@ -122,12 +399,12 @@ class FiniteDiscrete:
 		
 		"""
 
-		mean = self.get_mean()
-		return sum([self.probs[val] * (val - mean)**2 for val in [*self.probs]]) / sum([self.probs[val] for val in [*self.probs]])
+		return self.get_moment(2, c = self.get_mean())
 
+	@memoized_stat
 	def get_median(self):
 		"""
-		Computes the median of the distr. 
+		Computes the median of the distr, as the smallest value with cumulative probability >= 0.5.
 
 		Returns
 		------------
@@ -135,16 +412,9 @@ class FiniteDiscrete:
 		
 		"""
 
-		vals = [*self.probs]
-		vals.sort()
-		cum_prob = 0.0
-
-		for val in vals:
-			if cum_prob >= .5: break
-			cum_prob += self.probs[val]
-
-		return val
+		return self.ppf(.5)
 
+	@memoized_stat
 	def get_mode(self):
 		"""
 		Computes the mode of the distr. 
@@ -154,8 +424,9 @@ class FiniteDiscrete:
 		float
 		
 		"""
-		return max(self.probs, key = self.probs.get)
+		return self.values[np.argmax(self.probabilities)]
 
+	@memoized_moment
 	def get_moment(self, n, c = 0): 
 		"""
 		Computes the n-th moment of the distr, centered on c. 
@@ -173,8 +444,9 @@ class FiniteDiscrete:
 		
 		"""
 
-		return sum([self.probs[val] * (val - c)**n for val in [*self.probs]]) / sum([self.probs[val] for val in [*self.probs]])
+		return float(self.probabilities @ (self.values - c)**n)
 
+	@memoized_stat
 	def get_entropy(self):
 		"""
 		Computes the entropy of the distr. 
@@ -184,24 +456,86 @@ class FiniteDiscrete:
 		float
 		
 		"""
-		sum_weigs = sum([self.probs[val] for val in [*self.probs]])
-		return - sum([self.probs[val] * log(self.probs[val] / sum_weigs) for val in [*self.probs]]) / sum_weigs
+		return float(- self.probabilities @ np.log(self.probabilities))
 
-	def get_samples(self, k = 1):
+	def get_samples(self, k = 1, rng = None, out = None, stratified = False, antithetic = False):
 		"""
 		Generates k samples of the distr. 
+		Stratified and antithetic samples always use inverse transform sampling, whatever self.sampler is. 
 
 		Arguments
 		------------
 		k: int >= 0
 			The number of samples to generate. 
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None. 
+		out: np.ndarray or None
+			Preallocated array of length k where the samples are written, to reuse memory in hot loops. 
+			Default value of None, for a new array. 
+		stratified: bool
+			If True, one uniform is drawn in each of the k intervals [i/k, (i+1)/k). Default value of False. 
+		antithetic: bool
+			If True, uniforms come in pairs u and 1-u. Default value of False. 
+		workers: int >= 1 or None
+			If given, samples are drawn by this many processes, each with an independent stream, writing into shared memory. 
+			Default value of None, for sampling in this process. 
 
 		Returns
 		------------
-		list[floats]
+		np.ndarray[float]
 		
 		"""
-		return self.tree_repr.get_samples(k)
+		if self.sampler == "inverse" or stratified or antithetic: 
+			return self.get_inverse_samples(k, rng, out, stratified, antithetic)
+		if self.sampler == "alias": 
+			return self.alias_repr.get_samples(k, rng, out)
+		return self.tree_repr.get_samples(k, rng, out)
+
+	def get_inverse_samples(self, k = 1, rng = None, out = None, stratified = False, antithetic = False):
+		"""
+		Generates k samples of the distr by inverse transform: uniforms are mapped to values with a binary search over self.cum_probs. 
+		Stratified and antithetic uniforms reduce the variance of Monte Carlo estimators built from the samples. 
+		The uniforms are shuffled, so any prefix of the result is still a valid sample. 
+
+		Arguments
+		------------
+		k: int >= 0
+			The number of samples to generate. 
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None. 
+		out: np.ndarray or None
+			Preallocated array of length k where the samples are written. Default value of None, for a new array. 
+		stratified: bool
+			If True, one uniform is drawn in each of the k intervals [i/k, (i+1)/k). 
+			Combined with antithetic, the strata are used for the first half of the pairs. Default value of False. 
+		antithetic: bool
+			If True, uniforms come in pairs u and 1-u. Default value of False. 
+
+		Returns
+		------------
+		np.ndarray[float]
+		
+		"""
+		rng = get_rng(rng)
+
+		# Number of uniforms drawn, the antithetic ones are derived from them
+		n_base = (k + 1) // 2 if antithetic else k
+
+		if stratified: 
+			u = (np.arange(n_base) + rng.random(n_base)) / n_base
+		else: 
+			u = rng.random(n_base)
+
+		if antithetic: 
+			u = np.concatenate([u, 1. - u])
+
+		# Shuffling before truncating, so an odd k drops a random uniform instead of the last stratum
+		if stratified or antithetic: 
+			rng.shuffle(u)
+		u = u[:k]
+
+		idx = np.minimum(np.searchsorted(self.cum_probs, u, side = "right"), len(self.values) - 1)
+		return np.take(self.values, idx, out = out)
 
 
 
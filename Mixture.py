@@ -0,0 +1,245 @@
+
+import numpy as np
+
+from ProbDistr import ProbDistr
+from FiniteDiscrete import FiniteDiscrete
+from auxs import get_rng, memoized_stat, memoized_moment
+
+class Mixture(ProbDistr):
+	"""
+	Class to deal with mixtures of distributions: each realization comes from one of the components, picked at random with the given weights.
+	"""
+
+	def __init__(self, components, weights = None):
+		"""
+		Generates the basic object.
+
+		Arguments
+		------------
+		components: list of ProbDistr
+			Distributions being mixed.
+		weights: array-like or None
+			The relative weight of each component. Dont have to be normalized. Should be in the same order as components.
+			Default value of None, for equal weights.
+
+		"""
+
+		# Check components is a non empty list of distributions
+		if not isinstance(components, (list, tuple)) or not all(isinstance(comp, ProbDistr) for comp in components):
+			raise TypeError("Mixture components have to be a list of distributions")
+		assert len(components) > 0, "Mixture needs at least one component"
+
+		weights = np.ones(len(components)) if weights is None else np.asarray(weights, dtype = float)
+
+		# Check weights are non negative, and that the sum > 0
+		assert weights.shape == (len(components), ), "There has to be one weight per component"
+		assert (weights >= 0).all(), "Weights must be non-negative"
+		assert weights.sum() > 0, "Weights can not be all 0"
+
+		self.components = list(components)
+		self.weights = weights / weights.sum()
+
+		# FiniteDiscrete representation, only built when needed
+		self._finite = None
+
+	def pmf(self, k):
+		"""
+		Computes the probability of every value in k, as the weighted sum of the pmfs of the components.
+
+		Arguments
+		------------
+		k: float or array-like
+			Values to evaluate.
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as k
+
+		"""
+		return np.tensordot(self.weights, np.stack([np.asarray(comp.pmf(k), dtype = float) for comp in self.components]), axes = 1)[()]
+
+	def logpmf(self, k):
+		"""
+		Computes the logarithm of the probability of every value in k, with a log-sum-exp over the components, so it does not underflow.
+
+		Arguments
+		------------
+		k: float or array-like
+			Values to evaluate. Values outside the support get -inf.
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as k
+
+		"""
+		with np.errstate(divide = "ignore"):
+			log_terms = np.log(self.weights).reshape((-1, ) + (1, ) * np.ndim(k)) + \
+				np.stack([np.asarray(comp.logpmf(k), dtype = float) for comp in self.components])
+
+		top = log_terms.max(axis = 0)
+		top_safe = np.where(np.isfinite(top), top, 0.)
+		with np.errstate(divide = "ignore"):
+			return (top_safe + np.log(np.exp(log_terms - top_safe).sum(axis = 0)))[()]
+
+	def cdf(self, x):
+		"""
+		Computes the cumulative probability P(X <= x) of every value in x, as the weighted sum of the cdfs of the components.
+
+		Arguments
+		------------
+		x: float or array-like
+			Values to evaluate.
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as x
+
+		"""
+		return np.tensordot(self.weights, np.stack([np.asarray(comp.cdf(x), dtype = float) for comp in self.components]), axes = 1)[()]
+
+	def sf(self, x):
+		"""
+		Computes the survival function P(X > x) of every value in x, as the weighted sum of the ones of the components.
+
+		Arguments
+		------------
+		x: float or array-like
+			Values to evaluate.
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as x
+
+		"""
+		return np.tensordot(self.weights, np.stack([np.asarray(comp.sf(x), dtype = float) for comp in self.components]), axes = 1)[()]
+
+	def to_finite(self):
+		"""
+		Gets a FiniteDiscrete with the atoms of the to_finite of every component, with their weighted probabilities.
+		Its tail_bound is the weighted sum of the ones of the components.
+		Built on first use, with inverse transform sampling so no sampler is built.
+
+		Returns
+		------------
+		FiniteDiscrete
+
+		"""
+		if self._finite is None:
+			finites = [comp.to_finite() for comp in self.components]
+			values = np.concatenate([fin.values for fin in finites])
+			probs = np.concatenate([w * fin.probabilities for w, fin in zip(self.weights, finites)])
+			self._finite = FiniteDiscrete.from_arrays(values, probs, sampler = "inverse")
+			self._finite.tail_bound = float(self.weights @ [fin.tail_bound for fin in finites])
+
+		return self._finite
+
+	@memoized_stat
+	def get_mean(self):
+		"""
+		Computes the unconditional mean of the distr.
+
+		Returns
+		------------
+		float
+
+		"""
+		return float(self.weights @ [comp.get_mean() for comp in self.components])
+
+	def get_std(self):
+		"""
+		Computes the standard deviation of the distr.
+
+		Returns
+		------------
+		float
+
+		"""
+		return self.get_var()**0.5
+
+	@memoized_stat
+	def get_var(self):
+		"""
+		Computes the variance of the distr.
+
+		Returns
+		------------
+		float
+
+		"""
+		return self.get_moment(2, c = self.get_mean())
+
+	@memoized_stat
+	def get_mode(self):
+		"""
+		Computes the mode of the distr, from its finite representation.
+
+		Returns
+		------------
+		float
+
+		"""
+		return self.to_finite().get_mode()
+
+	@memoized_moment
+	def get_moment(self, n, c = 0):
+		"""
+		Computes the n-th moment of the distr, centered on c, as the weighted sum of the moments of the components.
+
+		Arguments
+		------------
+		n: int
+			The moment to calculate. Has to be a positive integer, supported by every component.
+		c: float
+			The center of the calculation. Default value of 0.
+
+		Returns
+		------------
+		float
+
+		"""
+		return float(self.weights @ [comp.get_moment(n, c = c) for comp in self.components])
+
+	@memoized_stat
+	def get_entropy(self):
+		"""
+		Computes the entropy of the distr, from its finite representation, as it has no closed form.
+
+		Returns
+		------------
+		float
+
+		"""
+		return self.to_finite().get_entropy()
+
+	def get_samples(self, k = 1, rng = None):
+		"""
+		Generates k samples of the distr.
+		The number of samples of each component is drawn with a single multinomial, each component is sampled in one batch,
+		and the result is shuffled, so samples are not grouped by component.
+
+		Arguments
+		------------
+		k: int >= 0
+			The number of samples to generate.
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None.
+		workers: int >= 1 or None
+			If given, samples are drawn by this many processes, each with an independent stream, writing into shared memory.
+			Default value of None, for sampling in this process.
+
+		Returns
+		------------
+		np.ndarray
+
+		"""
+		rng = get_rng(rng)
+
+		counts = rng.multinomial(k, self.weights)
+		samples = np.concatenate([np.asarray(comp.get_samples(int(count), rng = rng)) for comp, count in zip(self.components, counts) if count > 0] or [np.zeros(0)])
+		rng.shuffle(samples)
+
+		return samples
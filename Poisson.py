@@ -1,16 +1,57 @@
 
 import numpy as np
 
-from math import log, exp, factorial, ceil
+from math import log, exp, factorial, ceil, floor, e, pi
 
-from auxs import InfiniteSet
+from ProbDistr import ProbDistr
+from FiniteDiscrete import FiniteDiscrete
+from auxs import InfiniteSet, LRUCache, get_rng, poisson_logpmf, xlogy, memoized_stat
 
-class Poisson: 
+# Below this lambda samples are drawn by inversion over a cumulative table, above it with PTRS rejection
+TABLE_LAMBDA = 10
+
+# Above this lambda the entropy is given by its asymptotic expansion
+ASYMPTOTIC_LAMBDA = 1e3
+
+# Standard deviations around lambda first summed for the entropy, and relative error allowed for the terms left out
+ENTROPY_WINDOW = 40
+ENTROPY_TOL = 1e-15
+
+# Probability mass left out by default by Poisson.to_finite
+TRUNCATION_TOL = 1e-12
+
+
+def get_entropy_tail_bound(log_prob, ratio): 
+	"""
+	Bounds the sum of -p log p over a tail whose first probability is exp(log_prob), where each probability is at most ratio times the previous one. 
+	As -x log x increases for x < 1/e, the tail is below the one of p_j = p_0 ratio^j: p_0 (L / (1 - r) + s r / (1 - r)^2), with L = -log p_0 and s = -log r. 
+
+	Arguments
+	------------
+	log_prob: float
+		Logarithm of the first probability of the tail. Has to be below -1. 
+	ratio: float
+		Between 0 and 1. 
+
+	Returns
+	------------
+	float
+	
+	"""
+	if ratio <= 0: 
+		return 0.
+	if log_prob >= -1 or ratio >= 1: 
+		return np.inf
+
+	L, s = - log_prob, - log(ratio)
+	return exp(log_prob) * (L / (1 - ratio) + s * ratio / (1 - ratio)**2)
+
+class Poisson(ProbDistr): 
 	"""
 	Class to deal with Poisson distributions. 
 	"""
 
-	def __init__(self, _lambda): 
+	def __init__(self, _lambda, cache_size = None): 
 		"""
 		Generates the basic object. 
 
@@ -18,6 +59,9 @@ class Poisson:
 		------------
 		_lambda: float
 			Parameter of the distribution. 
+		cache_size: int >= 1 or None
+			If given, self.probs memoizes up to cache_size values, evicting the least recently used ones. 
+			Default value of None, for no memoization. 
 		
 		"""
 
@@ -35,13 +79,18 @@ class Poisson:
 		self.support = InfiniteSet(base_set = "N")
 
 		# Creates the prob function 
+		self.cache_size = cache_size
 		self.probs = self.get_prob_function()
 
+		# Cumulative table for sampling small lambdas, and finite representations by tolerance, only built when needed
+		self._cum_table = None
+		self._finite = dict()
+
 
 	def get_prob_function(self):
 		"""
 		Creates self.probs function to evaluate the probability of a value. 
-		Use memoization and the recurrence formula P(k+1) = P(k) * lambda / (k+1)
+		If self.cache_size is set, uses a bounded LRU memoization of the evaluated values. 
 
 		Returns
 		------------
@@ -50,31 +99,78 @@ class Poisson:
 		
 		"""
 
-		def memoized_PDF(): 
+		if self.cache_size is None: 
+			def PDF(value): 
+				return float(self.pmf(value))
+
+			return PDF
 
-			# Cache for known values
-			cache = dict()
+		cache = LRUCache(self.cache_size)
 
-			# Base step: P(0) is easy to compute
-			cache[0] = exp(-self._lambda)
+		def memoized_PDF(value): 
+			prob = cache.get(value)
+			if prob is None: 
+				prob = float(self.pmf(value))
+				cache.put(value, prob)
+			return prob
 
+		return memoized_PDF
 
-			def PDF(value):
-				# If value not in support, prob is 0
-				if value not in self.support: return 0.0
+	def __getstate__(self): 
+		"""
+		Pickles the object without self.probs, a local function that can not be pickled, so it can be sent to worker processes. 
+		"""
+		state = self.__dict__.copy()
+		del state["probs"]
+		return state
 
-				# If prob has been memoized, no need for calculation
-				# Otherwise, we advance using the recursion formula, memoizing the steps
-				if value > len(cache)-1: 
-					i = len(cache)-1
-					while i < value: 
-						cache[i+1] = cache[i] * self._lambda / (i+1)
-						i += 1
-				return cache[value]
+	def __setstate__(self, state): 
+		"""
+		Restores a pickled object, rebuilding self.probs, with an empty cache if memoized. 
+		"""
+		self.__dict__.update(state)
+		self.probs = self.get_prob_function()
 
-			return PDF
+	def logpmf(self, k): 
+		"""
+		Computes the logarithm of the probability of every value in k, in O(1) per value. 
+		Evaluated in log space with the saddle point form of auxs.special.poisson_logpmf, so it does not underflow and keeps full precision for large lambdas. 
+
+		Arguments
+		------------
+		k: int or array-like
+			Values to evaluate. Values outside the support get -inf. 
 
-		return memoized_PDF()
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as k
+		
+		"""
+		k = np.asarray(k, dtype = float)
+
+		# Values outside the support are evaluated at 0, and masked at the end
+		in_supp = self.support.contains_many(k)
+		k_supp = np.where(in_supp, k, 0.)
+
+		return np.where(in_supp, poisson_logpmf(k_supp, self._lambda), -np.inf)[()]
+
+	def pmf(self, k): 
+		"""
+		Computes the probability of every value in k, in O(1) per value. 
+
+		Arguments
+		------------
+		k: int or array-like
+			Values to evaluate. Values outside the support get 0. 
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as k
+		
+		"""
+		return np.exp(self.logpmf(k))
 
 	def get_mean(self):
 		"""
@@ -161,36 +257,191 @@ class Poisson:
 		elif n == 1: 
 			return self.get_mean() - c
 		else:
-			(self.get_mean - c)**2 + self.get_var()
-		return
+			return (self.get_mean() - c)**2 + self.get_var()
 
+	@memoized_stat
 	def get_entropy(self):
 		"""
 		Computes the entropy of the distr. 
-		Returns None, as no closed form is known. 
+		For lambda >= ASYMPTOTIC_LAMBDA uses the expansion 1/2 log(2 pi e lambda) - 1/(12 lambda) - 1/(24 lambda^2) - 19/(360 lambda^3), 
+		whose error is O(lambda^-4), below 1e-12. 
+		Otherwise sums -p log p over a window around lambda, widened until the bound on the terms left out is below ENTROPY_TOL times the result. 
+
+		Returns
+		------------
+		float
+		
+		"""
+		_lambda = self._lambda
+
+		if _lambda >= ASYMPTOTIC_LAMBDA: 
+			return 0.5 * log(2 * pi * e * _lambda) - 1 / (12 * _lambda) - 1 / (24 * _lambda**2) - 19 / (360 * _lambda**3)
+
+		width = ENTROPY_WINDOW * (_lambda**0.5 + 1)
+		while True: 
+			lo, hi = max(0, floor(_lambda - width)), ceil(_lambda + width)
+
+			# Normalizing cancels any rounding error shared by every value
+			log_probs = self.logpmf(np.arange(lo, hi + 1))
+			log_probs -= log(np.exp(log_probs).sum())
+			probs = np.exp(log_probs)
+			entropy = float(- probs @ np.where(probs > 0, log_probs, 0.))
+
+			# Terms above hi decrease at least by a ratio lambda / (hi + 2), and terms below lo by (lo - 1) / lambda
+			bound = get_entropy_tail_bound(float(self.logpmf(hi + 1)), _lambda / (hi + 2))
+			if lo > 0: 
+				bound += get_entropy_tail_bound(float(self.logpmf(lo - 1)), (lo - 1) / _lambda)
+
+			if bound <= ENTROPY_TOL * entropy: 
+				return entropy
+			width *= 2
+
+	def get_cum_table(self): 
+		"""
+		Creates the cumulative probabilities P(X <= k) for k = 0, 1, ... until the tail is below machine precision. 
+		Only used for small lambdas, where the table has a few dozen entries. 
+
+		Returns
+		------------
+		np.ndarray
+		
+		"""
+		if self._cum_table is None: 
+			prob = exp(-self._lambda)
+			cum_probs = [prob]
+			while len(cum_probs) <= self._lambda or prob > 1e-17: 
+				prob *= self._lambda / len(cum_probs)
+				cum_probs.append(cum_probs[-1] + prob)
+
+			cum_probs[-1] = 1.
+			self._cum_table = np.array(cum_probs)
+
+		return self._cum_table
+
+	def get_tail_log_bound(self, k): 
+		"""
+		Computes the Chernoff bound of the tail beyond k: log P(X >= k) if k >= lambda, or log P(X <= k) if k <= lambda. 
+		Both are k - lambda - k log(k / lambda), which decreases as k moves away from lambda. 
+
+		Arguments
+		------------
+		k: int >= 0
 
 		Returns
 		------------
 		float
 		
 		"""
-		return None
+		return k - self._lambda - float(xlogy(k, k / self._lambda))
+
+	def get_truncation(self, tol = TRUNCATION_TOL): 
+		"""
+		Finds a window of the support holding all but tol of the probability mass, with O(log) evaluations of the Chernoff bounds. 
+
+		Arguments
+		------------
+		tol: float between 0 and 1
+			Maximum probability mass outside the window. Default value of TRUNCATION_TOL. 
+
+		Returns
+		------------
+		tuple(int, int, float)
+			The first and last values of the window, and a bound of the probability mass outside it, at most tol. 
+		
+		"""
+		assert 0 < tol < 1, "tol has to be between 0 and 1"
+
+		log_tol = log(tol / 2)
+
+		def get_first_below(k, direction): 
+			"""
+			Finds the first k, moving away from lambda in direction, with a tail bound below tol / 2, by doubling and bisecting. 
+			"""
+			step = 1
+			while self.get_tail_log_bound(k + direction * step) > log_tol: 
+				step *= 2
+			lo, hi = step // 2, step
+			while hi - lo > 1: 
+				mid = (lo + hi) // 2
+				if self.get_tail_log_bound(k + direction * mid) > log_tol: 
+					lo = mid
+				else: 
+					hi = mid
+			return k + direction * hi
+
+		# P(X > hi) = P(X >= hi + 1)
+		hi = get_first_below(ceil(self._lambda), 1) - 1
+		bound = exp(self.get_tail_log_bound(hi + 1))
+
+		# P(X < lo) = P(X <= lo - 1), with no lower tail when the whole bound at 0 is too large
+		if self.get_tail_log_bound(0) > log_tol: 
+			lo = 0
+		else: 
+			lo = get_first_below(floor(self._lambda), -1) + 1
+			bound += exp(self.get_tail_log_bound(lo - 1))
+
+		return lo, hi, bound
+
+	def to_finite(self, tol = TRUNCATION_TOL, sampler = "inverse"): 
+		"""
+		Creates a FiniteDiscrete with the values of the window given by get_truncation(tol), and their renormalized probabilities. 
+		The Chernoff bound of the probability mass left out, at most tol, is kept in its tail_bound attribute. 
+		Results are cached on the object, by tolerance and sampler. 
+
+		Arguments
+		------------
+		tol: float between 0 and 1
+			Maximum probability mass left out. Default value of TRUNCATION_TOL. 
+		sampler: str
+			Engine used by get_samples. See FiniteDiscrete.__init__. 
+			Default value of "inverse", so no sampler is built when only cdf, sf or ppf are needed. Use "alias" for O(1) sampling. 
+
+		Returns
+		------------
+		FiniteDiscrete
+		
+		"""
+		if (tol, sampler) not in self._finite: 
+			lo, hi, bound = self.get_truncation(tol)
+			support = np.arange(lo, hi + 1)
+			finite = FiniteDiscrete.from_arrays(support, self.pmf(support), sampler = sampler)
+			finite.tail_bound = bound
+			self._finite[tol, sampler] = finite
 
-	def get_samples(self, k = 1):
+		return self._finite[tol, sampler]
+
+	def get_samples(self, k = 1, rng = None):
 		"""
-		Generates k samples of the distr. 
+		Generates k samples of the distr, in O(1) expected time per sample for any lambda. 
+		Small lambdas use inversion with a binary search over a cached cumulative table. 
+		Larger ones use NumPy's Generator.poisson, which implements the PTRS transformed rejection method (Hormann, 1993). 
 
 		Arguments
 		------------
 		k: int >= 0
 			The number of samples to generate. 
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None. 
+		workers: int >= 1 or None
+			If given, samples are drawn by this many processes, each with an independent stream, writing into shared memory. 
+			Default value of None, for sampling in this process. 
 
 		Returns
 		------------
-		list[floats]
+		np.ndarray[int]
 		
 		"""
-		return None
+		if not isinstance(k, int): 
+			raise TypeError("k parameter has to be int")
+
+		assert k >= 0, "k parameter can not be negative"
+
+		rng = get_rng(rng)
+
+		if self._lambda < TABLE_LAMBDA: 
+			return np.searchsorted(self.get_cum_table(), rng.random(k), side = "right")
+
+		return rng.poisson(self._lambda, size = k)
 
 
 
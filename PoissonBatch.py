@@ -0,0 +1,173 @@
+
+import numpy as np
+
+from Poisson import Poisson
+from auxs.sampling import DEFAULT_CHUNK_SIZE, iter_sample_chunks
+from auxs import parallelized, InfiniteSet, get_rng, poisson_logpmf
+
+class PoissonBatch: 
+	"""
+	Class to deal with many Poisson distributions at once, one per lambda parameter. 
+	Every method broadcasts over the parameter array, replacing a Python loop over Poisson objects. 
+	As results have the broadcast shape of the arguments and the parameters, it is not a ProbDistr, and has no cdf, ppf or sum. Index it to get Poisson objects. 
+	"""
+
+	def __init__(self, _lambda): 
+		"""
+		Generates the basic object. 
+
+		Arguments
+		------------
+		_lambda: float or array-like of floats
+			Parameters of the distributions. 
+		
+		"""
+
+		_lambda = np.array(_lambda, dtype = float)
+
+		# Check lambda is greater than 0
+		assert (_lambda > 0).all(), "Lambda parameters have to be positive for a Poisson distribution"
+
+		# Assign lambda params, as a read only array
+		self._lambda = _lambda
+		self._lambda.flags.writeable = False
+
+		# Support set, shared by every distribution, as the set of all natural numbers
+		self.support = InfiniteSet(base_set = "N")
+
+	@property
+	def shape(self): 
+		return self._lambda.shape
+
+	def __len__(self): return len(self._lambda)
+
+	def __getitem__(self, idx): 
+		"""
+		Gets the distributions at idx: a Poisson object for a single one, a PoissonBatch otherwise. 
+		"""
+		_lambda = self._lambda[idx]
+		if np.ndim(_lambda) == 0: 
+			return Poisson(float(_lambda))
+		return PoissonBatch(_lambda)
+
+	def logpmf(self, k): 
+		"""
+		Computes the logarithm of the probability of k under every distribution. 
+
+		Arguments
+		------------
+		k: int or array-like
+			Values to evaluate, broadcasted against the parameters. Values outside the support get -inf. 
+
+		Returns
+		------------
+		np.ndarray
+			Broadcasted shape of k and the parameters
+		
+		"""
+		k = np.asarray(k, dtype = float)
+
+		# Values outside the support are evaluated at 0, and masked at the end
+		in_supp = self.support.contains_many(k)
+		k_supp = np.where(in_supp, k, 0.)
+
+		return np.where(in_supp, poisson_logpmf(k_supp, self._lambda), -np.inf)
+
+	def pmf(self, k): 
+		"""
+		Computes the probability of k under every distribution. 
+
+		Arguments
+		------------
+		k: int or array-like
+			Values to evaluate, broadcasted against the parameters. Values outside the support get 0. 
+
+		Returns
+		------------
+		np.ndarray
+			Broadcasted shape of k and the parameters
+		
+		"""
+		return np.exp(self.logpmf(k))
+
+	def get_mean(self): 
+		"""
+		Computes the unconditional mean of every distr. 
+
+		Returns
+		------------
+		np.ndarray
+		
+		"""
+		return self._lambda.copy()
+
+	def get_std(self): 
+		"""
+		Computes the standard deviation of every distr. 
+
+		Returns
+		------------
+		np.ndarray
+		
+		"""
+		return self.get_var()**0.5
+
+	def get_var(self): 
+		"""
+		Computes the variance of every distr. 
+
+		Returns
+		------------
+		np.ndarray
+		
+		"""
+		return self._lambda.copy()
+
+	@parallelized
+	def get_samples(self, k = 1, rng = None): 
+		"""
+		Generates k samples of every distr, in a single vectorized draw. 
+
+		Arguments
+		------------
+		k: int >= 0
+			The number of samples to generate for each distr. 
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None. 
+		workers: int >= 1 or None
+			If given, samples are drawn by this many processes, each with an independent stream, writing into shared memory. 
+			Default value of None, for sampling in this process. 
+
+		Returns
+		------------
+		np.ndarray[int]
+			Of shape (k, *self.shape)
+		
+		"""
+		if not isinstance(k, int): 
+			raise TypeError("k parameter has to be int")
+
+		assert k >= 0, "k parameter can not be negative"
+
+		return get_rng(rng).poisson(self._lambda, size = (k,) + self.shape)
+
+	def iter_samples(self, k = None, chunk_size = DEFAULT_CHUNK_SIZE, rng = None): 
+		"""
+		Lazily generates samples of every distr in fixed size chunks, using constant memory. 
+
+		Arguments
+		------------
+		k: int >= 0 or None
+			Total number of samples of each distr. Default value of None, for an endless stream. 
+		chunk_size: int >= 1
+			Number of samples of each distr per chunk. The last chunk may be shorter. 
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None. 
+
+		Returns
+		------------
+		generator of np.ndarray
+			Chunks of shape (size, *self.shape)
+		
+		"""
+		return iter_sample_chunks(self.get_samples, k, chunk_size, rng)
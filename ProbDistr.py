@@ -1,10 +1,189 @@
 
+import numpy as np
 
+from auxs.sampling import DEFAULT_CHUNK_SIZE, iter_sample_chunks, parallelized
 
 
 class ProbDistr: 
 	"""
 	Superclass to deal with every king of probability distribution. 
+	Subclasses define get_samples(k, rng), and pmf or logpmf, or to_finite. 
+	Every other method of the protocol has a vectorized default built on them. 
+	Methods are element-wise: pmf, logpmf, cdf, sf and ppf give a result of the same shape as their argument, and a float for a scalar. 
+	Families of many distributions at once, like BinomialBatch, broadcast against their parameters instead, so they are not ProbDistr. 
+	The get_samples of every subclass also accepts workers, for parallel sampling. See auxs.sampling.parallelized. 
 	"""
-	pass
 
+	def __init_subclass__(cls, **kwargs): 
+		super().__init_subclass__(**kwargs)
+		if "get_samples" in cls.__dict__: 
+			cls.get_samples = parallelized(cls.__dict__["get_samples"])
+
+	def pmf(self, k): 
+		"""
+		Computes the probability of every value in k. 
+		Defaults to exp(logpmf), or to the pmf of to_finite if logpmf is not defined either. 
+
+		Arguments
+		------------
+		k: float or array-like
+			Values to evaluate. 
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as k
+		
+		"""
+		if type(self).logpmf is ProbDistr.logpmf: 
+			return self.to_finite().pmf(k)
+		return np.exp(self.logpmf(k))
+
+	def logpmf(self, k): 
+		"""
+		Computes the logarithm of the probability of every value in k. Defaults to log(pmf), with -inf outside the support. 
+
+		Arguments
+		------------
+		k: float or array-like
+			Values to evaluate. 
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as k
+		
+		"""
+		with np.errstate(divide = "ignore"): 
+			return np.log(self.pmf(k))
+
+	def cdf(self, x): 
+		"""
+		Computes the cumulative probability P(X <= x) of every value in x. Defaults to the one of to_finite. 
+
+		Arguments
+		------------
+		x: float or array-like
+			Values to evaluate. 
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as x
+		
+		"""
+		return self.to_finite().cdf(x)
+
+	def sf(self, x): 
+		"""
+		Computes the survival function P(X > x) of every value in x. Defaults to the one of to_finite. 
+
+		Arguments
+		------------
+		x: float or array-like
+			Values to evaluate. 
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as x
+		
+		"""
+		return self.to_finite().sf(x)
+
+	def ppf(self, q): 
+		"""
+		Computes the quantile function: the smallest value v with P(X <= v) >= q, for every q. Defaults to the one of to_finite. 
+
+		Arguments
+		------------
+		q: float or array-like
+			Probabilities between 0 and 1. 
+
+		Returns
+		------------
+		float or np.ndarray
+			Same shape as q
+		
+		"""
+		return self.to_finite().ppf(q)
+
+	def get_median(self): 
+		"""
+		Computes the median of the distr, as the smallest value with cumulative probability >= 0.5. 
+
+		Returns
+		------------
+		float
+		
+		"""
+		return self.ppf(.5)
+
+	def to_finite(self): 
+		"""
+		Gets a FiniteDiscrete representing the distribution, exactly or up to a negligible probability mass. 
+		Subclasses with a finite representation define it. 
+
+		Returns
+		------------
+		FiniteDiscrete
+		
+		"""
+		raise NotImplementedError(f"{type(self).__name__} has no finite representation")
+
+	def sample(self, k = 1, rng = None): 
+		"""
+		Generates k samples of the distr. Same as get_samples(k, rng = rng). 
+
+		Arguments
+		------------
+		k: int >= 0
+			The number of samples to generate. 
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None. 
+
+		Returns
+		------------
+		np.ndarray
+		
+		"""
+		return self.get_samples(k, rng = rng)
+
+	def iter_samples(self, k = None, chunk_size = DEFAULT_CHUNK_SIZE, rng = None): 
+		"""
+		Lazily generates samples of the distr in fixed size chunks, using constant memory. 
+
+		Arguments
+		------------
+		k: int >= 0 or None
+			Total number of samples. Default value of None, for an endless stream. 
+		chunk_size: int >= 1
+			Number of samples per chunk. The last chunk may be shorter. 
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None. 
+
+		Returns
+		------------
+		generator of np.ndarray
+		
+		"""
+		return iter_sample_chunks(self.get_samples, k, chunk_size, rng)
+
+	def __add__(self, other): 
+		"""
+		Distribution of the sum of self and other, assumed independent. See convolution.convolve. 
+
+		Arguments
+		------------
+		other: ProbDistr, int or float
+		
+		Returns
+		------------
+		ProbDistr
+		
+		"""
+		from convolution import convolve
+		return convolve(self, other)
+
+	def __radd__(self, other): 
+		return self.__add__(other)
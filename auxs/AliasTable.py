@@ -0,0 +1,105 @@
+
+
+import numpy as np
+
+from .sampling import get_rng
+
+class AliasTable:
+	"""
+	Class that generates a Walker/Vose alias table for the states of a finite discrete distribution.
+	Useful for sampling a FiniteDiscrete in O(1) per sample.
+	"""
+
+	def __init__(self, values, weights):
+		"""
+		Generates the alias table in O(n).
+
+		Arguments
+		------------
+		values: array-like
+			Possible values in the support
+		weights: array-like
+			The relative weight of each element. Dont have to be normalized. Should be in the same order as values.
+
+		"""
+
+		self.values = np.asarray(values)
+		weights = np.asarray(weights, dtype = float)
+		n = len(weights)
+
+		assert n > 0, "Alias table can not be empty"
+
+		# Scaling the weights so that the average column has height 1
+		scaled = (weights * n / weights.sum()).tolist()
+		prob = [1.] * n
+		alias = list(range(n))
+
+		# Splitting the columns in the ones below and above the average
+		small = [i for i in range(n) if scaled[i] < 1]
+		large = [i for i in range(n) if scaled[i] >= 1]
+
+		# Each small column is filled up with the excess of a large one
+		while small and large:
+			s, l = small.pop(), large.pop()
+			prob[s], alias[s] = scaled[s], l
+			scaled[l] = (scaled[l] + scaled[s]) - 1
+			if scaled[l] < 1:
+				small.append(l)
+			else:
+				large.append(l)
+
+		# Remaining columns are full up to rounding errors, so they keep prob 1
+
+		self.prob = np.array(prob)
+		self.alias = np.array(alias)
+
+	@classmethod
+	def from_tables(cls, values, prob, alias):
+		"""
+		Generates the table from already built arrays, used as they are, so they can be memory-mapped.
+
+		Arguments
+		------------
+		values: np.ndarray
+			Possible values in the support
+		prob: np.ndarray
+			Probability of keeping each column instead of its alias
+		alias: np.ndarray
+			Alias of each column
+
+		Returns
+		------------
+		AliasTable
+
+		"""
+		table = cls.__new__(cls)
+		table.values, table.prob, table.alias = values, prob, alias
+		return table
+
+	def get_samples(self, n = 1, rng = None, out = None):
+		"""
+		Get n samples from the table using the relative weights as probabilities.
+		A single uniform per sample picks the column and decides between it and its alias.
+
+		Arguments
+		------------
+		n: int >= 0
+			Number of samples to get. Default value of 1.
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None.
+		out: np.ndarray or None
+			Preallocated array of length n where the samples are written. Default value of None, for a new array.
+
+		Returns
+		------------
+		np.ndarray
+			Containing the n values sampled. It is out, if given.
+
+		"""
+		size = len(self.prob)
+
+		u = get_rng(rng).random(n) * size
+		cols = np.minimum(u.astype(np.intp), size - 1)
+		cols = np.where(u - cols < self.prob[cols], cols, self.alias[cols])
+
+		return np.take(self.values, cols, out = out)
@@ -1,8 +1,10 @@
 
 
-import copy
 import numpy as np
 
+from .Node import Node
+from .sampling import DEFAULT_CHUNK_SIZE, get_rng, iter_sample_chunks
+
 class BinaryTree: 
 	"""
 	Class that generates a balanced binary tree for the states of a finete discrete distribution. 
@@ -22,6 +24,9 @@ class BinaryTree:
 		
 		"""
 
+		# Flat array representation of the tree, only built when sampling
+		self._flat = None
+
 		if len(values) == 0: 
 			self.root = None
 			return
@@ -35,93 +40,147 @@ class BinaryTree:
 			val, wei = values.pop(), weights.pop()
 			self.root.add_value(value = val, weight = wei)
 
-	def add_value(self, value, weight): 
+	@property
+	def root(self): 
 		"""
-		A new value is being added to the tree. 
-
-		Arguments
-		------------
-		value: float
-			The value of the node
-
-		weight: float >= 0
-			The weight that the new value has to compare the probabilities of each node. Non negative. 
-
+		Root Node of the tree, or None if the tree is empty. 
+		Trees loaded from flat arrays rebuild their nodes on first access. 
 		"""
-		if self.root == None: 
-			self.root = Node(value = value, weight = weight)
-		else:
-			self.root.add_value(value, weight)
+		if self._root is None and self._flat is not None: 
+			self._root = self.get_root_from_flat()
+		return self._root
 
-	def describe(self):
+	@root.setter
+	def root(self, node): 
+		self._root, self._flat = node, None
+
+	@classmethod
+	def from_flat(cls, left, right, split, leaf_values): 
 		"""
-		Prints all the nodes that are part of the tree, in order of apparience. 
+		Generates the tree from the arrays given by get_flat_arrays, without creating any Node. 
+		The arrays are used as they are, so they can be memory-mapped. 
 
 		Arguments
 		------------
-		depth: int >= 0
-			Keeps track of how many levels down this node is with respect to the root
+		left, right, split, leaf_values: np.ndarray
+			See BinaryTree.get_flat_arrays
+
+		Returns
+		------------
+		BinaryTree
+		
+		"""
+		tree = cls([], [])
+		tree._flat = (left, right, split, leaf_values)
+		return tree
 
+	def __getstate__(self): 
 		"""
-		self.root.describe(depth = 0)
+		Pickles the flat arrays instead of the Node graph, which is slow and can hit the recursion limit. 
+		"""
+		state = dict(self.__dict__)
+		if self._root is not None: 
+			self.get_flat_arrays()
+			state["_root"], state["_flat"] = None, self._flat
+		return state
 
-	def get_samples(self, n = 1): 
+	def get_root_from_flat(self): 
 		"""
-		Get n samples from the tree using the relative weights as probabilities. 
+		Creates the Node graph from the flat arrays, iteratively. 
+		Weights are rebuilt relative to a root of weight 1. 
 
-		Arguments
-		------------
-		n: int >= 1
-			Number of samples to get. Default value of 0. 
-		
 		Returns
 		------------
-		list
-			Containing the n values sampled
-
+		Node
+		
 		"""
-		return self.root.get_samples(n)
+		left, right, split, leaf_values = self._flat
 
+		# Breadth-first order: every parent comes before its children
+		weights = np.empty(len(left))
+		weights[0] = 1.
+		for i in range(len(left)): 
+			if left[i] >= 0: 
+				weights[left[i]] = weights[i] * split[i]
+				weights[right[i]] = weights[i] * (1 - split[i])
 
-class Node: 
-	"""
-	Class that generates the nodes of the binary tree. 
-	Useful for sampling a FineteDiscrete in O(log n)
-	"""
+		nodes = [Node(value = leaf_values[i].item() if left[i] < 0 else None, weight = weights[i].item()) for i in range(len(left))]
+		for i in range(len(left)): 
+			if left[i] >= 0: 
+				nodes[i].left, nodes[i].right = nodes[left[i]], nodes[right[i]]
 
-	def __init__(self, value, weight): 
-		self.value = value
-		self.weight = weight
-		self.left = None
-		self.right = None
+		return nodes[0]
 
-	def redefined_as(self, new_node):
+	@classmethod
+	def from_arrays(cls, values, weights): 
 		"""
-		Redirect self to the new_node object, copying all of its atributtes. 
+		Generates the binary tree in a single pass, in O(n log n). 
+		Huffman-style construction: the two lightest subtrees are merged repeatedly, so heavy values stay close to the root and no subtree is ever copied. 
+		Leaves are sorted once, and merged subtrees come out in non decreasing weight, so two queues replace the heap. 
 
 		Arguments
 		------------
-		new_node: Node
-			The node that replaces the self pointer
+		values: array-like
+			Possible values in the support
+		weights: array-like
+			The relative weight of each element. Dont have to be normalized. Should be in the same order as values. 
 
+		Returns
+		------------
+		BinaryTree
+		
 		"""
-		self.value, self.weight, self.left, self.right = new_node.value, new_node.weight, new_node.left, new_node.right
+		tree = cls([], [])
+		if len(values) == 0: 
+			return tree
+
+		# Queue of leaves, sorted by weight, and queue of merged subtrees
+		values, weights = list(values), list(weights)
+		leaves = [Node(value = values[i], weight = weights[i]) for i in np.argsort(weights, kind = "stable")]
+		merged = []
+		i, j = 0, 0
+
+		# Merging the two lightest subtrees, keeping the convention that the left one is the heaviest
+		while (len(leaves) - i) + (len(merged) - j) > 1: 
+			pair = []
+			for _ in range(2): 
+				if j == len(merged) or (i < len(leaves) and leaves[i].weight <= merged[j].weight): 
+					pair.append(leaves[i])
+					i += 1
+				else: 
+					pair.append(merged[j])
+					j += 1
+
+			right, left = pair
+			parent = Node(value = None, weight = left.weight + right.weight)
+			parent.left, parent.right = left, right
+			merged.append(parent)
+
+		tree.root = merged[-1] if merged else leaves[0]
+		return tree
 
-	def get_copy(self):
+	def add_value(self, value, weight): 
 		"""
-		Gets a copy object of self. Useful for add_value method. 
+		A new value is being added to the tree. 
 
-		Returns
+		Arguments
 		------------
-		Node
-			A copy of self
+		value: float
+			The value of the node
+
+		weight: float >= 0
+			The weight that the new value has to compare the probabilities of each node. Non negative. 
 
 		"""
-		return copy.deepcopy(self)
+		if self.root == None: 
+			self.root = Node(value = value, weight = weight)
+		else:
+			self.root.add_value(value, weight)
+			self._flat = None
 
-	def describe(self, depth = 0):
+	def describe(self):
 		"""
-		Prints every element of the self object, and all of the nodes below, in order. 
+		Prints all the nodes that are part of the tree, in order of apparience. 
 
 		Arguments
 		------------
@@ -129,110 +188,120 @@ class Node:
 			Keeps track of how many levels down this node is with respect to the root
 
 		"""
-		print("val:", self.value)
-		print("wei", self.weight, "\n")
-
-		if self.left == None: 
-			print("left: None")
-		else:
-			print(f"left ({depth}): ")
-			self.left.describe(depth = depth + 1)
-
-		if self.right == None: 
-			print("right: None")
-		else:
-			print(f"right ({depth}): ")
-			self.right.describe(depth = depth + 1)
+		self.root.describe(depth = 0)
 
-	def add_value(self, value, weight): 
+	def get_flat_arrays(self): 
 		"""
-		A new value is being added to the node. 
-		Note there is the convention that the left node has always >= value than the right one. 
+		Gets the tree as flat arrays, indexed by node in breadth-first order, with the root at 0. 
+		Built iteratively on first use, and rebuilt after the tree changes. 
 
-		Arguments
+		Returns
 		------------
-		value: float
-			The value of the node
-
-		weight: float >= 0
-			The weight that the new value has to compare the probabilities of each node. Non negative. 
-
+		tuple(np.ndarray, np.ndarray, np.ndarray, np.ndarray)
+			left: index of the left child of each node, -1 for leaves
+			right: index of the right child of each node, -1 for leaves
+			split: probability of going to the left child, for internal nodes
+			leaf_values: value of each leaf
+		
 		"""
-
-		# Node is a leaf 
-		if self.value != None: 
-			new_node = Node(value = None, weight = weight + self.weight)
-			if self.weight > weight: 
-				new_node.left = self.get_copy()
-				new_node.right = Node(value = value, weight = weight)
-			else:
-				new_node.left = Node(value = value, weight = weight)
-				new_node.right = self.get_copy()
-			self.redefined_as(new_node)
-
-		# Node is intermediate
-		else:
-
-			# The new node is greater than the examined node
-			if weight > self.weight: 
-				new_node = Node(value = None, weight = weight + self.weight)
-				new_node.left = Node(value = value, weight = weight)
-				new_node.right = self.get_copy()
-				self.redefined_as(new_node)
-
-			# The new node is greater than the left child, but not the examined node
-			elif weight > self.left.weight: 
-				new_node = Node(value = None, weight = weight + self.weight)
-				new_node.left = self.get_copy()
-				new_node.right = Node(value = value, weight = weight)
-				self.redefined_as(new_node)
-
-			# The new node plus the right child is greater than the left child
-			elif weight + self.right.weight > self.left.weight: 
-				new_node = Node(value = None, weight = weight + self.weight)
-				new_node.left = self.right
-				new_node.right = self.left
-				new_node.left.add_value(value, weight)
-				self.redefined_as(new_node)
-			else: 
-				self.weight += weight
-				self.right.add_value(value, weight)
-			
-
-	def get_samples(self, n = 1): 
-		"""
-		Get n samples from the node using the relative weights as probabilities
+		if self._flat is None: 
+			nodes, left, right, split = [self.root], [], [], []
+			leaf_idx, leaf_vals = [], []
+
+			i = 0
+			while i < len(nodes): 
+				node = nodes[i]
+				if node.value != None: 
+					left.append(-1)
+					right.append(-1)
+					split.append(0.)
+					leaf_idx.append(i)
+					leaf_vals.append(node.value)
+				else: 
+					left.append(len(nodes))
+					right.append(len(nodes) + 1)
+					split.append(min(node.left.weight / node.weight, 1.) if node.weight > 0 else .5)
+					nodes.extend([node.left, node.right])
+				i += 1
+
+			leaf_vals = np.array(leaf_vals)
+			leaf_values = np.zeros(len(nodes), dtype = leaf_vals.dtype)
+			leaf_values[leaf_idx] = leaf_vals
+
+			self._flat = (np.array(left), np.array(right), np.array(split), leaf_values)
+
+		return self._flat
+
+	def get_samples(self, n = 1, rng = None, out = None): 
+		"""
+		Get n samples from the tree using the relative weights as probabilities. 
+		Iterative: the counts of every node in a level are split with a single vectorized binomial draw, 
+		and each leaf writes its values once, directly into the output array. 
 
 		Arguments
 		------------
 		n: int >= 1
-			Number of samples to get
+			Number of samples to get. Default value of 0. 
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None. 
+		out: np.ndarray or None
+			Preallocated array of length n where the samples are written. Default value of None, for a new array. 
 		
 		Returns
 		------------
-		list
-			Containing the n values sampled
+		np.ndarray
+			Containing the n values sampled. It is out, if given. 
 
 		"""
+		left, right, split, leaf_values = self.get_flat_arrays()
+		rng = get_rng(rng)
 
-		if self.value != None: 
-			return np.repeat(self.value, n)
-
-		n_samples_left = np.random.binomial(n = n, p = self.left.weight / self.weight)
-		n_samples_right = n - n_samples_left
-
-		return np.append(self.left.get_samples(n_samples_left), self.right.get_samples(n_samples_right))
-
+		if out is None: 
+			out = np.empty(n, dtype = leaf_values.dtype)
+		assert len(out) == n, "out has to have length n"
 
+		# Nodes of the current level that received samples, and how many each
+		nodes, counts = np.array([0]), np.array([n])
+		pos = 0
 
+		while len(nodes) > 0: 
 
+			# Leaves write their values
+			is_leaf = left[nodes] < 0
+			leaf_counts = counts[is_leaf]
+			n_leaf_samples = leaf_counts.sum()
+			out[pos:pos + n_leaf_samples] = np.repeat(leaf_values[nodes[is_leaf]], leaf_counts)
+			pos += n_leaf_samples
 
+			# Internal nodes split their samples between both children
+			nodes, counts = nodes[~is_leaf], counts[~is_leaf]
+			n_left = rng.binomial(counts, split[nodes])
+			nodes = np.concatenate([left[nodes], right[nodes]])
+			counts = np.concatenate([n_left, counts - n_left])
+			nodes, counts = nodes[counts > 0], counts[counts > 0]
 
+		return out
 
+	def iter_samples(self, n = None, chunk_size = DEFAULT_CHUNK_SIZE, rng = None): 
+		"""
+		Lazily gets samples from the tree in fixed size chunks, using constant memory. 
 
+		Arguments
+		------------
+		n: int >= 0 or None
+			Total number of samples. Default value of None, for an endless stream. 
+		chunk_size: int >= 1
+			Number of samples per chunk. The last chunk may be shorter. 
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None. 
+		
+		Returns
+		------------
+		generator of np.ndarray
 
+		"""
+		return iter_sample_chunks(self.get_samples, n, chunk_size, rng)
 
 
 
 
-		
@@ -0,0 +1,156 @@
+
+
+import numpy as np
+
+class FenwickTree: 
+	"""
+	Class that generates a Fenwick (binary indexed) tree over an array of weights, stored in a flat array. 
+	Useful for updating weights and sampling a dynamic finite discrete distribution in O(log n). 
+	"""
+
+	def __init__(self, weights): 
+		"""
+		Generates the tree in O(n). 
+
+		Arguments
+		------------
+		weights: array-like
+			Non negative weight of each position. 
+		
+		"""
+		self.weights = np.array(weights, dtype = float)
+		self.build()
+
+	def __len__(self): return len(self.weights)
+
+	def build(self): 
+		"""
+		Rebuilds the tree from self.weights, vectorized. 
+		Node i (1-indexed) stores the sum of the weights in (i - lowbit(i), i]. 
+		"""
+		n = len(self.weights)
+		prefix = np.concatenate([[0.], np.cumsum(self.weights)])
+		i = np.arange(1, n + 1)
+
+		self.tree = np.zeros(n + 1)
+		self.tree[1:] = prefix[i] - prefix[i - (i & -i)]
+
+		# Updates since the last build, they accumulate rounding errors
+		self.n_updates = 0
+
+	def resize(self, capacity): 
+		"""
+		Changes the number of positions to capacity, padding with zero weights or truncating. 
+
+		Arguments
+		------------
+		capacity: int >= 0
+		
+		"""
+		weights = np.zeros(capacity)
+		n = min(capacity, len(self.weights))
+		weights[:n] = self.weights[:n]
+		self.weights = weights
+		self.build()
+
+	def set_weight(self, i, weight): 
+		"""
+		Sets the weight of position i, in O(log n). 
+
+		Arguments
+		------------
+		i: int
+			Position, 0-indexed. 
+		weight: float >= 0
+		
+		"""
+		delta = weight - self.weights[i]
+		self.weights[i] = weight
+
+		# Rebuilding from time to time, so rounding errors do not accumulate
+		self.n_updates += 1
+		if self.n_updates > len(self.weights): 
+			self.build()
+			return
+
+		n = len(self.weights)
+		j = i + 1
+		while j <= n: 
+			self.tree[j] += delta
+			j += j & -j
+
+	def prefix_sum(self, i): 
+		"""
+		Computes the sum of the weights of the positions before i, in O(log n). 
+
+		Arguments
+		------------
+		i: int
+			Number of positions to add up, from 0. 
+
+		Returns
+		------------
+		float
+		
+		"""
+		total = 0.
+		while i > 0: 
+			total += self.tree[i]
+			i -= i & -i
+		return total
+
+	def get_total(self): 
+		"""
+		Computes the sum of all the weights, in O(log n). 
+
+		Returns
+		------------
+		float
+		
+		"""
+		return self.prefix_sum(len(self.weights))
+
+	def search(self, u): 
+		"""
+		Finds, for every u, the position i whose weight interval [prefix_sum(i), prefix_sum(i+1)) contains u. 
+		Vectorized descent over the tree, O(log n) array operations in total. 
+		Only positions with a positive weight are returned, as long as there is one. 
+
+		Arguments
+		------------
+		u: array-like
+			Values between 0 and self.get_total(). 
+
+		Returns
+		------------
+		np.ndarray[int]
+			Positions, 0-indexed
+		
+		"""
+		n = len(self.weights)
+		remaining = np.array(u, dtype = float)
+		pos = np.zeros(remaining.shape, dtype = np.int64)
+
+		step = 1 << (n.bit_length() - 1) if n > 0 else 0
+		while step > 0: 
+			nxt = pos + step
+			valid = nxt <= n
+			partial = self.tree[np.minimum(nxt, n)]
+			go = valid & (partial <= remaining)
+			pos = np.where(go, nxt, pos)
+			remaining = np.where(go, remaining - partial, remaining)
+			step >>= 1
+
+		if n == 0: 
+			return pos - 1
+		pos = np.minimum(pos, n - 1)
+
+		# Rounding errors can take u past the last positive weight, or onto a zero weight that left a tiny residue in the tree. 
+		# Those rare positions move back to the closest positive weight before them, or to the first one if there is none. 
+		zero = self.weights[pos] == 0
+		if zero.any(): 
+			positive = np.flatnonzero(self.weights > 0)
+			if len(positive) > 0: 
+				pos[zero] = positive[np.maximum(np.searchsorted(positive, pos[zero]) - 1, 0)]
+
+		return pos
@@ -1,223 +1,308 @@
 
+import numpy as np
 
-class InfiniteSet: 
+from bisect import bisect_right
+
+from .Interval import Interval
+
+
+# Known sets, by every accepted name
+BASE_SETS = {
+	("naturals", "N"): Interval(0, np.inf, integer = True),
+	("negative naturals", "NN"): Interval(-np.inf, 0, integer = True),
+	("positive naturals", "N+"): Interval(1, np.inf, integer = True),
+	("strictly negative naturals", "N-"): Interval(-np.inf, -1, integer = True),
+	("integers", "Z"): Interval(-np.inf, np.inf, integer = True),
+	("reals", "R"): Interval(-np.inf, np.inf),
+}
+
+
+class InfiniteSet:
 	"""
-	Class that allows to deal with a set of potentially infinite numbers. 
+	Class that allows to deal with a set of potentially infinite numbers.
+	The set is a union of integer and real intervals, minus a finite set of exceptions,
+	optionally united with, intersected with, or excluding other InfiniteSets.
 	"""
 
 	def __init__(self, base_set = "naturals", exceptions_set = None):
 		"""
-		Generates the set. 
+		Generates the set.
 
 		Arguments
 		------------
-		base_set: str
-			Name of the set, if looking for a known set. 
-			Can be: 
+		base_set: str, Interval or list of Intervals
+			Name of the set, if looking for a known set, or the intervals whose union is the set.
+			Names can be:
 				- "naturals" or "N" for natural numbers
 				- "negative naturals" or "NN" for the negative version of every natural number
 				- "positive naturals" or "N+" for natural numbers without the 0
 				- "strictly negative naturals" or "N-" for negative natural numbers without the 0
 				- "integers" or "Z" for integers
-				- "rationals" or "Q" for rational numbers
-				- "irrationals" or "I" for irrational numbers
 				- "reals" or "R" for real numbers
 				- Default value: "naturals"
 
-		exceptions_set: set or list
-			Set of values to delete from the set. Can be a finite or infinite set. 
-			If an element is not in the base set, it wont be considered. 
-		
-		"""
-
-		assert isinstance(exceptions_set, InfiniteSet) or \
-			isinstance(exceptions_set, set) or isinstance(exceptions_set, list) or \
-			exceptions_set == None, "Exception sets must be an infinite set, set, list or None"
-
-		# Natural numbers
-		if base_set in ("naturals", "N"): 
-			self.create_natural_numbers(exceptions_set)
-
-		# Negative Naturals
-		elif base_set in ("negative naturals", "NN"): 
-			self.create_negative_naturals(exceptions_set)
+		exceptions_set: InfiniteSet, set, list, np.ndarray or None
+			Set of values to delete from the set. Can be a finite or infinite set.
+			If an element is not in the base set, it wont be considered.
 
-		# Positive naturals
-		elif  base_set in ("positive naturals", "N+"): 
-			self.create_positive_naturals(exceptions_set)
-
-		# Strictly negative numbers
-		elif  base_set in ("strictly negative naturals", "N-"): 
-			self.create_strictly_negative_naturals(exceptions_set)
-
-		# Integers
-		elif  base_set in ("integers", "Z"): 
-			self.create_integers(exceptions_set)
-
-		# Reals
-		elif  base_set in ("reals", "R"): 
-			self.create_reals(exceptions_set)
+		"""
 
-		# Invalid input
+		assert isinstance(exceptions_set, (InfiniteSet, set, frozenset, list, tuple, np.ndarray)) or \
+			exceptions_set is None, "Exception sets must be an infinite set, set, list or None"
+
+		if isinstance(base_set, str):
+			intervals = [interval for names, interval in BASE_SETS.items() if base_set in names]
+
+			# Invalid input
+			if not intervals:
+				err_txt = "Invalid base set selection. \n"
+				err_txt += "Must choose one from the following: \n"
+				err_txt += "\t* 'naturals' or 'N' for natural numbers \n"
+				err_txt += "\t* 'negative naturals' or 'NN' for negative natural numbers \n"
+				err_txt += "\t* 'positive naturals' or 'N+' for strictly positive natural numbers \n"
+				err_txt += "\t* 'strictly negative naturals' or 'N-' for strictly negative natural numbers \n"
+				err_txt += "\t* 'integers' or 'Z' for integer numbers \n"
+				err_txt += "\t* 'reals' or 'R' for real numbers \n"
+				raise AssertionError(err_txt)
+
+		elif isinstance(base_set, Interval):
+			intervals = [base_set]
 		else:
-			err_txt = "Invalid base set selection. \n"
-			err_txt += "Must choose one from the following: \n"
-			err_txt += "\t* 'naturals' or 'N' for natural numbers \n"
-			err_txt += "\t* 'negative naturals' or 'NN' for negative natural numbers \n"
-			err_txt += "\t* 'positive naturals' or 'N+' for strictly positive natural numbers \n"
-			err_txt += "\t* 'strictly negative naturals' or 'N-' for strictly negative natural numbers \n"
-			err_txt += "\t* 'integers' or 'Z' for integer numbers \n"
-			err_txt += "\t* 'reals' or 'R' for real numbers \n"
-			raise AssertionError(err_txt)
+			intervals = list(base_set)
+			assert all(isinstance(interval, Interval) for interval in intervals), "Base set must be a name, an Interval or a list of Intervals"
 
+		self.set_intervals(intervals)
 
-	def __contains__(self, value): return self.validator(value)
+		# Other sets in the union, sets every value must also be in, and infinite sets of exceptions
+		self.united, self.intersected, self.excluded = (), (), ()
 
+		if isinstance(exceptions_set, InfiniteSet):
+			self.excluded = (exceptions_set, )
+			exceptions_set = None
+		self.set_exceptions(exceptions_set)
 
-	def create_natural_numbers(self, exceptions_set):
-		"""
-		Create the object to be the set of all natural numbers
+	def set_exceptions(self, *exceptions_sets):
 		"""
+		Normalizes the finite exceptions into a frozenset, for O(1) scalar lookups, and a sorted array, for O(log m) vectorized ones.
 
-		# Assigning the set of exceptions
-		if exceptions_set == None: 
-			self.exceptions_set = set()
-		else:
-			self.exceptions_set = exceptions_set
+		Arguments
+		------------
+		*exceptions_sets: iterables of numbers or None
+			Their union is the set of exceptions.
 
-		# Creating and assigning the function to validate whether a value is within the set or not
-		def validator(value):
-			if isinstance(value, int): return not (value in self.exceptions_set) and value >= 0
-			if isinstance(value, float) and (value - int(value)) == 0.0: return not (value in self.exceptions_set) and value >= 0
-			return False
+		"""
+		exceptions = [np.ravel(np.asarray(exc if isinstance(exc, np.ndarray) else list(exc), dtype = float)) for exc in exceptions_sets if exc is not None]
+		exceptions = np.unique(np.concatenate([np.zeros(0)] + exceptions))
+		self.exceptions_array = exceptions[~ np.isnan(exceptions)]
+		self.exceptions_set = frozenset(self.exceptions_array.tolist())
 
-		self.validator = validator
+	def set_intervals(self, intervals):
+		"""
+		Merges the intervals, and indexes them by kind, for O(log k) lookups with a binary search over their lower bounds.
+		Merged intervals of the same kind are disjoint, so a value can only be in the last one starting at or before it.
 
+		Arguments
+		------------
+		intervals: list of Interval
 
-	def create_negative_naturals(self, exceptions_set):
 		"""
-		Create the object to be the set of all negative natural numbers
+		self.intervals = self.get_merged_intervals(intervals)
+
+		# Sorted intervals and lower bounds of each kind, for scalar lookups, and arrays of their bounds, for vectorized ones
+		self.kinds, self.bounds = dict(), dict()
+		for integer in (True, False):
+			kind = tuple(interval for interval in self.intervals if interval.integer == integer)
+			if not kind:
+				continue
+			self.kinds[integer] = (kind, [interval.lower for interval in kind])
+			self.bounds[integer] = (
+				np.array([interval.lower for interval in kind]),
+				np.array([interval.upper for interval in kind]),
+				np.array([interval.closed[0] for interval in kind]),
+				np.array([interval.closed[1] for interval in kind]),
+			)
+
+	def intervals_contain(self, value):
 		"""
+		Checks if a single float is in any of the intervals, in O(log k).
+		"""
+		for kind, lowers in self.kinds.values():
+			idx = bisect_right(lowers, value) - 1
+			if idx >= 0 and value in kind[idx]:
+				return True
+		return False
 
-		# Assigning the set of exceptions
-		if exceptions_set == None: 
-			self.exceptions_set = set()
-		else:
-			self.exceptions_set = exceptions_set
-
-		# Creating and assigning the function to validate whether a value is within the set or not
-		def validator(value):
-			if isinstance(value, int): return not (value in self.exceptions_set) and value <= 0
-			if isinstance(value, float) and (value - int(value)) == 0.0: return not (value in self.exceptions_set) and value <= 0
-			return False
+	def intervals_contain_many(self, values):
+		"""
+		Checks which of the values are in any of the intervals, with a binary search per kind, in O(log k) per value.
 
-		self.validator = validator
+		Arguments
+		------------
+		values: np.ndarray[float]
 
+		Returns
+		------------
+		np.ndarray[bool]
+			Same shape as values
 
-	def create_positive_naturals(self, exceptions_set):
 		"""
-		Create the object to be the set of all strictly positive natural numbers
+		mask = np.zeros(values.shape, dtype = bool)
+		finite = np.isfinite(values)
+		for integer, (lowers, uppers, left_closed, right_closed) in self.bounds.items():
+			idx = np.maximum(np.searchsorted(lowers, values, side = "right") - 1, 0)
+			in_kind = finite & np.where(left_closed[idx], values >= lowers[idx], values > lowers[idx])
+			in_kind &= np.where(right_closed[idx], values <= uppers[idx], values < uppers[idx])
+			if integer:
+				in_kind &= values == np.floor(values)
+			mask |= in_kind
+		return mask
+
+	@staticmethod
+	def get_merged_intervals(intervals):
 		"""
+		Drops empty intervals, and merges the ones of the same kind that overlap, in O(k log k).
+		Each kind is sorted by lower bound and swept once: an interval either merges with the last merged one or starts a new one,
+		as every earlier merged interval ends before the last one starts.
 
-		# Assigning the set of exceptions
-		if exceptions_set == None: 
-			self.exceptions_set = set()
-		else:
-			self.exceptions_set = exceptions_set
-
-		# Creating and assigning the function to validate whether a value is within the set or not
-		def validator(value):
-			if isinstance(value, int): return not (value in self.exceptions_set) and value > 0
-			if isinstance(value, float) and (value - int(value)) == 0.0: return not (value in self.exceptions_set) and value > 0
-			return False
-
-		self.validator = validator
+		Arguments
+		------------
+		intervals: list of Interval
 
+		Returns
+		------------
+		tuple of Interval
+			Sorted by lower bound
 
-	def create_strictly_negative_naturals(self, exceptions_set):
 		"""
-		Create the object to be the set of all strictly negative natural numbers
+		key = lambda interval: (interval.lower, not interval.closed[0])
+		intervals = sorted((interval for interval in intervals if not interval.is_empty()), key = key)
+
+		merged = []
+		for integer in (True, False):
+			last = None
+			for interval in (interval for interval in intervals if interval.integer == integer):
+				union = None if last is None else last.get_merged(interval)
+				if union is not None:
+					last = union
+					continue
+				if last is not None:
+					merged.append(last)
+				last = interval
+			if last is not None:
+				merged.append(last)
+
+		return tuple(sorted(merged, key = key))
+
+	def get_copy(self, **changes):
 		"""
-
-		# Assigning the set of exceptions
-		if exceptions_set == None: 
-			self.exceptions_set = set()
-		else:
-			self.exceptions_set = exceptions_set
-
-		# Creating and assigning the function to validate whether a value is within the set or not
-		def validator(value, exceptions_set):
-			if isinstance(value, int): return not (value in self.exceptions_set) and value < 0
-			if isinstance(value, float) and (value - int(value)) == 0.0: return not (value in self.exceptions_set) and value < 0
-			return False
-
-		self.validator = validator
-
-
-	def create_integers(self, exceptions_set):
+		Creates a shallow copy of the set, with some attributes changed.
 		"""
-		Create the object to be the set of all integer numbers
+		new = InfiniteSet.__new__(InfiniteSet)
+		new.__dict__.update(self.__dict__)
+		new.__dict__.update(changes)
+		return new
+
+	def __repr__(self):
+		parts = [" U ".join(map(repr, self.intervals)) or "{}"]
+		parts += [f"U ({other!r})" for other in self.united]
+		parts += [f"& ({other!r})" for other in self.intersected]
+		if len(self.exceptions_array) > 0:
+			parts.append(f"- {set(self.exceptions_set)}")
+		parts += [f"- ({other!r})" for other in self.excluded]
+		return "InfiniteSet(" + " ".join(parts) + ")"
+
+	def __contains__(self, value):
 		"""
+		Checks if a single number is part of the set, in O(log k) for k intervals and a fixed number of operations.
+		"""
+		if not isinstance(value, (int, float, np.integer, np.floating)):
+			return False
+		value = float(value)
 
-		# Assigning the set of exceptions
-		if exceptions_set == None: 
-			self.exceptions_set = set()
-		else:
-			self.exceptions_set = exceptions_set
-
-		# Creating and assigning the function to validate whether a value is within the set or not
-		def validator(value):
-			if isinstance(value, int): return not (value in self.exceptions_set)
-			if isinstance(value, float) and (value - int(value)) == 0.0: return not (value in self.exceptions_set)
+		if not (self.intervals_contain(value) or any(value in other for other in self.united)):
 			return False
+		if value in self.exceptions_set:
+			return False
+		return all(value in other for other in self.intersected) and not any(value in other for other in self.excluded)
+
+	def contains_many(self, values):
+		"""
+		Checks which of the values belong to the set, with a few NumPy passes instead of a Python call per value.
+		Intervals and exceptions are found with binary searches, in O(log k + log m) per value.
 
-		self.validator = validator
+		Arguments
+		------------
+		values: array-like
+			Numbers to check.
 
+		Returns
+		------------
+		np.ndarray[bool]
+			Same shape as values. A single bool for a scalar.
 
-	def create_reals(self, exceptions_set):
-		"""
-		Create the object to be the set of all real numbers
 		"""
+		values = np.asarray(values, dtype = float)
 
-		# Assigning the set of exceptions
-		if exceptions_set == None: 
-			self.exceptions_set = set()
-		else:
-			self.exceptions_set = exceptions_set
+		mask = self.intervals_contain_many(values)
+		for other in self.united:
+			mask |= other.contains_many(values)
 
-		# Creating and assigning the function to validate whether a value is within the set or not
-		def validator(value):
-			if isinstance(value, int): return not (value in self.exceptions_set)
-			if isinstance(value, float): return not (value in self.exceptions_set)
-			return False
+		for other in self.intersected:
+			mask &= other.contains_many(values)
 
-		self.validator = validator
+		if len(self.exceptions_array) > 0:
+			idx = np.minimum(np.searchsorted(self.exceptions_array, values), len(self.exceptions_array) - 1)
+			mask &= self.exceptions_array[idx] != values
 
+		for other in self.excluded:
+			mask &= ~ other.contains_many(values)
 
-	def create_reals(self, exceptions_set):
+		return mask[()]
+
+	def is_simple(self):
 		"""
-		Create the object to be the set of all real numbers
+		Checks if the set is just a union of intervals minus finite exceptions, with no other set involved.
 		"""
+		return not (self.united or self.intersected or self.excluded)
 
-		# Assigning the set of exceptions
-		if exceptions_set == None: 
-			self.exceptions_set = set()
-		else:
-			self.exceptions_set = exceptions_set
-
-		# Creating and assigning the function to validate whether a value is within the set or not
-		def validator(value):
-			if isinstance(value, int): return not (value in self.exceptions_set)
-			if isinstance(value, float): return not (value in self.exceptions_set)
-			return False
-
-		self.validator = validator
-
+	def __or__(self, other):
+		"""
+		Union with another InfiniteSet. Unions of intervals without exceptions are merged into a single set of intervals.
+		"""
+		if not isinstance(other, InfiniteSet):
+			return NotImplemented
 
+		if self.is_simple() and other.is_simple() and not (self.exceptions_set or other.exceptions_set):
+			return InfiniteSet(list(self.intervals) + list(other.intervals))
 
+		new = InfiniteSet([])
+		new.united = (self, other)
+		return new
 
+	def __and__(self, other):
+		"""
+		Intersection with another InfiniteSet. Intersections of simple sets are computed interval by interval.
+		"""
+		if not isinstance(other, InfiniteSet):
+			return NotImplemented
 
+		if self.is_simple() and other.is_simple():
+			new = InfiniteSet([a.intersect(b) for a in self.intervals for b in other.intervals])
+			new.set_exceptions(self.exceptions_array, other.exceptions_array)
+			return new
 
+		return self.get_copy(intersected = self.intersected + (other, ))
 
+	def __sub__(self, other):
+		"""
+		Difference with another InfiniteSet, or with a finite collection of numbers, that become exceptions.
+		"""
+		if isinstance(other, InfiniteSet):
+			return self.get_copy(excluded = self.excluded + (other, ))
 
+		if isinstance(other, (set, frozenset, list, tuple, np.ndarray)):
+			new = self.get_copy()
+			new.set_exceptions(self.exceptions_array, other)
+			return new
 
+		return NotImplemented
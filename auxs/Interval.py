@@ -0,0 +1,153 @@
+
+
+from math import ceil, floor, isfinite, isnan
+
+import numpy as np
+
+
+class Interval:
+	"""
+	Class that represents an interval of real numbers, or of integer numbers, with possibly infinite bounds.
+	Infinite bounds are never part of the interval.
+	"""
+
+	def __init__(self, lower = -np.inf, upper = np.inf, integer = False, closed = (True, True)):
+		"""
+		Generates the interval.
+
+		Arguments
+		------------
+		lower: float
+			Lower bound. Default value of -inf.
+		upper: float
+			Upper bound. Default value of inf.
+		integer: bool
+			If True, only the integers between the bounds are part of the interval. Default value of False.
+		closed: tuple(bool, bool)
+			Whether the lower and upper bounds are part of the interval. Default value of (True, True).
+
+		"""
+
+		assert not (isnan(lower) or isnan(upper)), "Interval bounds can not be NaN"
+
+		left_closed, right_closed = closed
+
+		# Integer intervals are stored with the closed bounds of the first and last integers
+		if integer:
+			if isfinite(lower):
+				lower, left_closed = (ceil(lower) if left_closed else floor(lower) + 1), True
+			if isfinite(upper):
+				upper, right_closed = (floor(upper) if right_closed else ceil(upper) - 1), True
+
+		self.lower, self.upper, self.integer = float(lower), float(upper), integer
+		self.closed = (left_closed and isfinite(lower), right_closed and isfinite(upper))
+
+	def __repr__(self):
+		left, right = "[" if self.closed[0] else "(", "]" if self.closed[1] else ")"
+		return f"{left}{self.lower:g}, {self.upper:g}{right}" + (" in Z" if self.integer else "")
+
+	def __eq__(self, other):
+		return isinstance(other, Interval) and (self.lower, self.upper, self.integer, self.closed) == (other.lower, other.upper, other.integer, other.closed)
+
+	def __hash__(self): return hash((self.lower, self.upper, self.integer, self.closed))
+
+	def __contains__(self, value):
+		"""
+		Checks if a single number is part of the interval, in O(1).
+		"""
+		if not isfinite(value) or (self.integer and value != floor(value)):
+			return False
+		above = value >= self.lower if self.closed[0] else value > self.lower
+		below = value <= self.upper if self.closed[1] else value < self.upper
+		return above and below
+
+	def is_empty(self):
+		"""
+		Checks if no number is part of the interval.
+
+		Returns
+		------------
+		bool
+
+		"""
+		return self.lower > self.upper or (self.lower == self.upper and not all(self.closed))
+
+	def contains_many(self, values):
+		"""
+		Checks which of the values are part of the interval, with a few NumPy passes.
+
+		Arguments
+		------------
+		values: np.ndarray[float]
+
+		Returns
+		------------
+		np.ndarray[bool]
+			Same shape as values
+
+		"""
+		mask = np.isfinite(values)
+		if self.integer:
+			mask &= values == np.floor(values)
+		mask &= (values >= self.lower) if self.closed[0] else (values > self.lower)
+		mask &= (values <= self.upper) if self.closed[1] else (values < self.upper)
+		return mask
+
+	def intersect(self, other):
+		"""
+		Computes the intersection with another interval. It is an integer interval if any of both is.
+
+		Arguments
+		------------
+		other: Interval
+
+		Returns
+		------------
+		Interval
+			Possibly empty
+
+		"""
+
+		# The largest lower bound, open if it is open in any interval sharing it
+		if self.lower != other.lower:
+			lower, left_closed = max((self.lower, self.closed[0]), (other.lower, other.closed[0]))
+		else:
+			lower, left_closed = self.lower, self.closed[0] and other.closed[0]
+
+		# The smallest upper bound, likewise
+		if self.upper != other.upper:
+			upper, right_closed = min((self.upper, self.closed[1]), (other.upper, other.closed[1]))
+		else:
+			upper, right_closed = self.upper, self.closed[1] and other.closed[1]
+
+		return Interval(lower, upper, integer = self.integer or other.integer, closed = (left_closed, right_closed))
+
+	def get_merged(self, other):
+		"""
+		Merges with another interval of the same kind into a single one, if their union is an interval.
+
+		Arguments
+		------------
+		other: Interval
+
+		Returns
+		------------
+		Interval or None
+			None if the union is not a single interval.
+
+		"""
+		if self.integer != other.integer:
+			return None
+
+		first, second = (self, other) if (self.lower, not self.closed[0]) <= (other.lower, not other.closed[0]) else (other, self)
+
+		# Integer intervals merge when they overlap or are adjacent, real ones when they overlap or touch at a closed bound
+		if self.integer:
+			joined = second.lower <= first.upper + 1
+		else:
+			joined = second.lower < first.upper or (second.lower == first.upper and (first.closed[1] or second.closed[0]))
+		if not joined:
+			return None
+
+		upper, right_closed = max((first.upper, first.closed[1]), (second.upper, second.closed[1]))
+		return Interval(first.lower, upper, integer = self.integer, closed = (first.closed[0], right_closed))
@@ -0,0 +1,71 @@
+
+
+from collections import OrderedDict
+
+class LRUCache: 
+	"""
+	Class that generates a dict-like cache with bounded size. 
+	When full, the least recently used entry is evicted. 
+	"""
+
+	def __init__(self, maxsize = 128): 
+		"""
+		Generates the empty cache. 
+
+		Arguments
+		------------
+		maxsize: int >= 1
+			Maximum number of entries to keep. Default value of 128. 
+		
+		"""
+
+		assert maxsize >= 1, "Cache size has to be at least 1"
+
+		self.maxsize = maxsize
+		self.data = OrderedDict()
+
+	def __contains__(self, key): return key in self.data
+
+	def __len__(self): return len(self.data)
+
+	def get(self, key, default = None): 
+		"""
+		Gets the value stored for key, marking it as the most recently used. 
+
+		Arguments
+		------------
+		key: hashable
+			Key to look for
+		default: object
+			Returned if key is not in the cache. Default value of None. 
+
+		Returns
+		------------
+		object
+		
+		"""
+		if key not in self.data: 
+			return default
+		self.data.move_to_end(key)
+		return self.data[key]
+
+	def put(self, key, value): 
+		"""
+		Stores value for key, evicting the least recently used entry if the cache is full. 
+
+		Arguments
+		------------
+		key: hashable
+		value: object
+		
+		"""
+		self.data[key] = value
+		self.data.move_to_end(key)
+		if len(self.data) > self.maxsize: 
+			self.data.popitem(last = False)
+
+	def clear(self): 
+		"""
+		Deletes every entry of the cache. 
+		"""
+		self.data.clear()
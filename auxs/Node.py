@@ -3,6 +3,8 @@
 import copy
 import numpy as np
 
+from .sampling import get_rng
+
 
 class Node: 
 	"""
@@ -120,29 +122,49 @@ class Node:
 				self.right.add_value(value, weight)
 			
 
-	def get_samples(self, n = 1): 
+	def get_samples(self, n = 1, rng = None, out = None): 
 		"""
 		Get n samples from the node using the relative weights as probabilities
+		Iterative, with an explicit stack of (node, count, position): each leaf writes its values directly into the output array. 
 
 		Arguments
 		------------
 		n: int >= 1
 			Number of samples to get
+		rng: np.random.Generator, int or None
+			Generator to sample with, or seed for a new one. Default value of None. 
+		out: np.ndarray or None
+			Preallocated array of length n where the samples are written. Default value of None, for a new array. 
 		
 		Returns
 		------------
-		list
-			Containing the n values sampled
+		np.ndarray
+			Containing the n values sampled. It is out, if given. 
 
 		"""
+		rng = get_rng(rng)
 
-		if self.value != None: 
-			return np.repeat(self.value, n)
+		if out is None: 
+			leaf = self
+			while leaf.value == None: 
+				leaf = leaf.left
+			out = np.empty(n, dtype = np.asarray(leaf.value).dtype)
+		assert len(out) == n, "out has to have length n"
+
+		stack = [(self, n, 0)]
+		while stack: 
+			node, count, pos = stack.pop()
+			if count == 0: continue
+
+			if node.value != None: 
+				out[pos:pos + count] = node.value
+				continue
 
-		n_samples_left = np.random.binomial(n = n, p = self.left.weight / self.weight)
-		n_samples_right = n - n_samples_left
+			n_samples_left = rng.binomial(n = count, p = min(node.left.weight / node.weight, 1.) if node.weight > 0 else .5)
+			stack.append((node.right, count - n_samples_left, pos + n_samples_left))
+			stack.append((node.left, n_samples_left, pos))
 
-		return np.append(self.left.get_samples(n_samples_left), self.right.get_samples(n_samples_right))
+		return out
 
 
 
@@ -1,4 +1,11 @@
 
 
+from .AliasTable import AliasTable
 from .BinaryTree import BinaryTree
-from .InfiniteSet import InfiniteSet
\ No newline at end of file
+from .FenwickTree import FenwickTree
+from .InfiniteSet import InfiniteSet
+from .Interval import Interval
+from .LRUCache import LRUCache
+from .memoize import memoized_stat, memoized_moment, clear_memoized
+from .sampling import get_rng, spawn_seeds, spawn_rngs, parallel_samples, parallelized
+from .special import gammaln, xlogy, stirlerr, bd0, binom_logpmf, poisson_logpmf
\ No newline at end of file
@@ -0,0 +1,60 @@
+
+
+from functools import wraps
+
+from .LRUCache import LRUCache
+
+# Maximum number of (n, c) moments kept per distribution
+MOMENTS_CACHE_SIZE = 128
+
+
+def memoized_stat(method): 
+	"""
+	Decorator for statistics without arguments (mean, variance, entropy, ...). 
+	The first result is stored on the instance, and reused on every later call. 
+	"""
+	name = method.__name__
+
+	@wraps(method)
+	def wrapper(self): 
+		cache = self.__dict__.setdefault("_stats_cache", dict())
+		if name not in cache: 
+			cache[name] = method(self)
+		return cache[name]
+
+	return wrapper
+
+
+def memoized_moment(method): 
+	"""
+	Decorator for get_moment(n, c). 
+	Results are stored on the instance in a LRUCache keyed by (n, c), bounded by MOMENTS_CACHE_SIZE. 
+	"""
+
+	@wraps(method)
+	def wrapper(self, n, c = 0): 
+		cache = self.__dict__.get("_moments_cache")
+		if cache is None: 
+			cache = self._moments_cache = LRUCache(MOMENTS_CACHE_SIZE)
+
+		key = (n, c)
+		if key not in cache: 
+			cache.put(key, method(self, n, c))
+		return cache.get(key)
+
+	return wrapper
+
+
+def clear_memoized(distr): 
+	"""
+	Deletes every statistic and moment memoized on distr. 
+	Has to be called whenever the distribution changes. 
+
+	Arguments
+	------------
+	distr: object
+		Instance with methods decorated by memoized_stat or memoized_moment
+	
+	"""
+	distr.__dict__.pop("_stats_cache", None)
+	distr.__dict__.pop("_moments_cache", None)
@@ -0,0 +1,238 @@
+
+
+import inspect
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import wraps
+from multiprocessing.shared_memory import SharedMemory
+
+
+def get_rng(rng = None): 
+	"""
+	Gets the numpy Generator to sample with. 
+
+	Arguments
+	------------
+	rng: np.random.Generator, int, np.random.SeedSequence or None
+		If Generator, it is returned as it is. 
+		Otherwise, it is used as the seed of a new Generator. None seeds it from the OS entropy. 
+
+	Returns
+	------------
+	np.random.Generator
+	
+	"""
+	if isinstance(rng, np.random.Generator): 
+		return rng
+	return np.random.default_rng(rng)
+
+
+def spawn_seeds(rng = None, n = 1): 
+	"""
+	Spawns n independent SeedSequence child streams, useful to seed parallel workers. 
+	The children only depend on rng, so the same seed always gives the same streams. 
+
+	Arguments
+	------------
+	rng: np.random.Generator, int, np.random.SeedSequence or None
+		Parent of the streams. If Generator, the parent seed is drawn from it. 
+	n: int >= 1
+		Number of streams to spawn. Default value of 1. 
+
+	Returns
+	------------
+	list[np.random.SeedSequence]
+	
+	"""
+	if isinstance(rng, np.random.Generator): 
+		rng = np.random.SeedSequence(rng.integers(0, 2**32, size = 4))
+	elif not isinstance(rng, np.random.SeedSequence): 
+		rng = np.random.SeedSequence(rng)
+	return rng.spawn(n)
+
+
+def spawn_rngs(rng = None, n = 1): 
+	"""
+	Spawns n independent Generators, one for each stream given by spawn_seeds. 
+
+	Arguments
+	------------
+	rng: np.random.Generator, int, np.random.SeedSequence or None
+		Parent of the streams. 
+	n: int >= 1
+		Number of Generators to spawn. Default value of 1. 
+
+	Returns
+	------------
+	list[np.random.Generator]
+	
+	"""
+	return [np.random.default_rng(seed) for seed in spawn_seeds(rng, n)]
+
+
+# Default number of samples per chunk when streaming
+DEFAULT_CHUNK_SIZE = 2**16
+
+
+def iter_sample_chunks(get_samples, k = None, chunk_size = DEFAULT_CHUNK_SIZE, rng = None): 
+	"""
+	Lazily yields samples in chunks, so memory stays bounded by chunk_size whatever k is. 
+	Every chunk is drawn from the same Generator, so a seed gives a reproducible stream. 
+
+	Arguments
+	------------
+	get_samples: function (int, rng) -> np.ndarray
+		Sampler of the distribution, called as get_samples(size, rng = rng)
+	k: int >= 0 or None
+		Total number of samples. Default value of None, for an endless stream. 
+	chunk_size: int >= 1
+		Number of samples per chunk. The last chunk may be shorter. Default value of DEFAULT_CHUNK_SIZE. 
+	rng: np.random.Generator, int or None
+		Generator to sample with, or seed for a new one. Default value of None. 
+
+	Returns
+	------------
+	generator of np.ndarray
+	
+	"""
+	assert k is None or k >= 0, "k parameter can not be negative"
+	assert chunk_size >= 1, "chunk_size parameter has to be at least 1"
+
+	rng = get_rng(rng)
+	remaining = k
+	while remaining is None or remaining > 0: 
+		size = chunk_size if remaining is None else min(chunk_size, remaining)
+		yield get_samples(size, rng = rng)
+		if remaining is not None: 
+			remaining -= size
+
+
+# Distribution sampled by each worker process, set once by init_worker
+WORKER_DISTR = None
+
+
+def init_worker(distr): 
+	"""
+	Stores the distribution to sample in the worker process. 
+	"""
+	global WORKER_DISTR
+	WORKER_DISTR = distr
+
+
+def sample_into_shared_memory(shm_name, dtype, shape, start, count, seed, kwargs): 
+	"""
+	Draws count samples of WORKER_DISTR, writing them in rows [start, start + count) of a shared memory array. 
+	Runs in a worker process, only the shared memory name travels back and forth. 
+
+	Arguments
+	------------
+	shm_name: str
+		Name of the SharedMemory block holding the output array
+	dtype: np.dtype
+		Type of the output array
+	shape: tuple
+		Shape of the whole output array
+	start, count: int
+		Rows of the output array assigned to this worker
+	seed: np.random.SeedSequence
+		Independent stream of this worker
+	kwargs: dict
+		Extra keyword arguments for get_samples
+	
+	"""
+	shm = SharedMemory(name = shm_name)
+	try: 
+		out = np.ndarray(shape, dtype = dtype, buffer = shm.buf)[start:start + count]
+		rng = np.random.default_rng(seed)
+
+		# Samplers with an out argument write straight into shared memory
+		if "out" in inspect.signature(WORKER_DISTR.get_samples).parameters and out.ndim == 1: 
+			WORKER_DISTR.get_samples(count, rng = rng, out = out, **kwargs)
+		else: 
+			out[...] = WORKER_DISTR.get_samples(count, rng = rng, **kwargs)
+		del out
+	finally: 
+		shm.close()
+
+
+def parallel_samples(distr, k, workers, rng = None, out = None, mp_context = None, **kwargs): 
+	"""
+	Generates k samples of distr with a pool of worker processes. 
+	Each worker gets an independent stream from spawn_seeds, and writes its slice of the result into shared memory, 
+	so samples are never pickled. For a fixed seed and number of workers, the result is reproducible. 
+	Under the spawn and forkserver start methods, distr is pickled once per worker. 
+
+	Arguments
+	------------
+	distr: object
+		Distribution with a get_samples(k, rng) method
+	k: int >= 0
+		The number of samples to generate. 
+	workers: int >= 1
+		Number of worker processes. 
+	rng: np.random.Generator, int or None
+		Parent of the worker streams. Default value of None. 
+	out: np.ndarray or None
+		Preallocated array of shape (k, ...) where the samples are copied from shared memory. Default value of None, for a new array. 
+	mp_context: multiprocessing context or None
+		Context used to start the workers. Default value of None, for the default start method of the platform. 
+	kwargs: 
+		Extra keyword arguments for get_samples
+
+	Returns
+	------------
+	np.ndarray
+	
+	"""
+	if not isinstance(k, int): 
+		raise TypeError("k parameter has to be int")
+
+	assert k >= 0, "k parameter can not be negative"
+	assert workers >= 1, "workers parameter has to be at least 1"
+
+	# A single sample tells the type and shape of the output
+	probe = np.asarray(distr.get_samples(1, rng = np.random.default_rng(0), **kwargs))
+	shape = (k,) + probe.shape[1:]
+
+	counts = [len(part) for part in np.array_split(np.arange(k), workers)]
+	starts = np.cumsum([0] + counts[:-1]).tolist()
+	seeds = spawn_seeds(rng, workers)
+
+	shm = SharedMemory(create = True, size = max(int(np.prod(shape)) * probe.dtype.itemsize, 1))
+	try: 
+		with ProcessPoolExecutor(max_workers = workers, mp_context = mp_context, initializer = init_worker, initargs = (distr,)) as pool: 
+			futures = [pool.submit(sample_into_shared_memory, shm.name, probe.dtype, shape, start, count, seed, kwargs) 
+				for start, count, seed in zip(starts, counts, seeds) if count > 0]
+			for future in futures: 
+				future.result()
+
+		shared = np.ndarray(shape, dtype = probe.dtype, buffer = shm.buf)
+		if out is None: 
+			out = shared.copy()
+		else: 
+			out[...] = shared
+		del shared
+	finally: 
+		shm.close()
+		shm.unlink()
+
+	return out
+
+
+def parallelized(get_samples): 
+	"""
+	Decorator for get_samples(k, rng, ...), adding the workers keyword argument: 
+	when it is given, samples are drawn with parallel_samples, and otherwise get_samples is called as it is. 
+	Applied by ProbDistr to the get_samples of every subclass. 
+	"""
+
+	@wraps(get_samples)
+	def wrapper(self, k = 1, rng = None, *args, workers = None, **kwargs): 
+		if workers is None: 
+			return get_samples(self, k, rng, *args, **kwargs)
+		if args: 
+			raise TypeError("Sampling options have to be passed by keyword when using workers")
+		return parallel_samples(self, k, workers, rng, **kwargs)
+
+	return wrapper
@@ -0,0 +1,282 @@
+
+
+import numpy as np
+
+from math import ceil, log, pi
+
+# Coefficients of the Stirling series for log(Gamma(z)), in powers of 1/z^2
+STIRLING_COEFS = (1 / 12, -1 / 360, 1 / 1260, -1 / 1680, 1 / 1188, -691 / 360360)
+
+# Arguments below this value are shifted up before using the Stirling series
+STIRLING_SHIFT = 10
+
+# Number of values evaluated at once by gammaln, bounding the size of its temporaries
+GAMMALN_BLOCK = 2**16
+
+# Above this value stirlerr uses the Stirling series, and below it log-gamma terms, that barely cancel for small values
+STIRLERR_SERIES = 15
+
+# Maximum number of terms of the series used by bd0 when x is close to m. Each one is below 1/100 of the previous one
+BD0_TERMS = 10
+
+
+def gammaln(x):
+	"""
+	Computes log(Gamma(x)) for every element of x, in a single vectorized pass.
+	Small arguments are shifted with Gamma(x) = Gamma(x + m) / (x (x+1) ... (x+m-1)),
+	so the Stirling series is always evaluated where it is accurate to machine precision.
+	Large arrays are evaluated in blocks of GAMMALN_BLOCK values, so the temporaries do not grow with the input.
+
+	Arguments
+	------------
+	x: float or array-like
+		Positive values to evaluate. Gamma(0) is infinite, so 0 returns inf.
+
+	Returns
+	------------
+	float or np.ndarray
+		Same shape as x
+
+	"""
+	x = np.asarray(x, dtype = float)
+	if x.size <= GAMMALN_BLOCK:
+		return gammaln_block(x)[()]
+
+	flat = x.ravel()
+	res = np.empty(flat.shape)
+	for start in range(0, len(flat), GAMMALN_BLOCK):
+		res[start:start + GAMMALN_BLOCK] = gammaln_block(flat[start:start + GAMMALN_BLOCK])
+	return res.reshape(x.shape)
+
+
+def gammaln_block(x):
+	"""
+	Computes log(Gamma(x)) for every element of the array x. See gammaln.
+
+	Arguments
+	------------
+	x: np.ndarray[float]
+
+	Returns
+	------------
+	np.ndarray
+		Same shape as x
+
+	"""
+	# Shifting the small arguments, keeping track of the product of the skipped terms
+	small = x < STIRLING_SHIFT
+	z = x.copy()
+	z[small] += STIRLING_SHIFT
+	log_prod = np.zeros(x.shape)
+	if small.any():
+		x_small = x[small]
+		prod = x_small.copy()
+		for i in range(1, STIRLING_SHIFT):
+			prod *= x_small + i
+		with np.errstate(divide = "ignore"):
+			log_prod[small] = np.log(prod)
+		del x_small, prod
+
+	series = stirling_series(z)
+
+	with np.errstate(divide = "ignore", invalid = "ignore"):
+		res = np.log(z)
+		res *= z - 0.5
+	res -= z
+	res += 0.5 * log(2 * pi)
+	res += series
+	res -= log_prod
+	return res
+
+
+def stirling_series(z):
+	"""
+	Computes the Stirling series log(Gamma(z)) - (z - 1/2) log(z) + z - log(2 pi) / 2, with Horner's rule.
+	Accurate to machine precision for z >= STIRLING_SHIFT.
+
+	Arguments
+	------------
+	z: np.ndarray[float]
+
+	Returns
+	------------
+	np.ndarray
+		Same shape as z
+
+	"""
+	inv = 1 / z
+	inv2 = inv * inv
+	series = np.full(z.shape, STIRLING_COEFS[-1])
+	for coef in reversed(STIRLING_COEFS[:-1]):
+		series *= inv2
+		series += coef
+	series *= inv
+	return series
+
+
+def stirlerr(x):
+	"""
+	Computes the error of Stirling's approximation, log(x!) - (x + 1/2) log(x) + x - log(2 pi) / 2, for every element of x.
+	Above STIRLERR_SERIES it is the Stirling series at x, small and accurate to machine precision, instead of a difference of large log-gamma terms.
+
+	Arguments
+	------------
+	x: float or array-like
+		Positive values to evaluate.
+
+	Returns
+	------------
+	float or np.ndarray
+		Same shape as x
+
+	"""
+	x = np.asarray(x, dtype = float)
+	res = np.array(stirling_series(np.maximum(x, STIRLERR_SERIES)))
+
+	small = x < STIRLERR_SERIES
+	if small.any():
+		x_small = x[small]
+		with np.errstate(divide = "ignore", invalid = "ignore"):
+			res[small] = gammaln(x_small + 1) - (x_small + 0.5) * np.log(x_small) + x_small - 0.5 * log(2 * pi)
+
+	return res[()]
+
+
+def bd0(x, m):
+	"""
+	Computes the deviance term x log(x / m) + m - x for every element, which is non negative and 0 at x = m.
+	When x is close to m it is evaluated with the series (x - m) v + 2 x sum_j v^(2j+1) / (2j+1), with v = (x - m) / (x + m),
+	which avoids the cancellation of the direct form (Loader, 2000).
+
+	Arguments
+	------------
+	x: float or array-like
+		Positive values.
+	m: float or array-like
+		Non negative values. m = 0 gives inf.
+
+	Returns
+	------------
+	float or np.ndarray
+		Broadcasted shape of x and m
+
+	"""
+	x, m = np.broadcast_arrays(np.asarray(x, dtype = float), np.asarray(m, dtype = float))
+	res = np.empty(x.shape)
+
+	near = np.abs(x - m) < 0.1 * (x + m)
+	if not near.all():
+		far = ~ near
+		x_far, m_far = x[far], m[far]
+		with np.errstate(divide = "ignore"):
+			res[far] = x_far * np.log(x_far / m_far) + m_far - x_far
+
+	if near.any():
+		# Windows around the mean are usually all near, and skip the copies
+		x_near, m_near = (x, m) if near.all() else (x[near], m[near])
+		v = (x_near - m_near) / (x_near + m_near)
+		v2 = v * v
+		res_near = (x_near - m_near) * v
+		term = 2 * x_near * v
+
+		# Terms decrease at least by a ratio max(v^2), so only the ones above machine precision are added
+		v2_max = float(v2.max())
+		n_terms = 1 if v2_max == 0 else min(BD0_TERMS, ceil(log(np.finfo(float).eps) / log(v2_max)) + 1)
+		for j in range(1, n_terms):
+			term *= v2
+			res_near += term / (2 * j + 1)
+		res[near] = res_near
+
+	return res[()]
+
+
+def binom_logpmf(k, n, p):
+	"""
+	Computes the logarithm of the Binomial(n, p) probability of every k, with Loader's saddle point form (Loader, 2000):
+	stirlerr(n) - stirlerr(k) - stirlerr(n - k) - bd0(k, n p) - bd0(n - k, n (1 - p)) + log(n / (2 pi k (n - k))) / 2.
+	Log-gamma terms lose about n eps of precision cancelling each other, while these terms are all small, so it is accurate for any n.
+
+	Arguments
+	------------
+	k: float or array-like
+		Integers between 0 and n.
+	n: int or array-like
+		Non negative integers.
+	p: float or array-like
+		Between 0 and 1.
+
+	Returns
+	------------
+	float or np.ndarray
+		Broadcasted shape of k, n and p
+
+	"""
+	k, n, p = (np.asarray(arg, dtype = float) for arg in (k, n, p))
+
+	# Terms that only depend on n are evaluated before broadcasting, so only once for a single n
+	n_pos = np.maximum(n, 1.)
+	log_probs_n = stirlerr(n_pos) + 0.5 * np.log(n_pos / (2 * pi))
+
+	# Values strictly inside the support use the saddle point form, the bounds are evaluated at k = 1, n = 2 meanwhile
+	k, n, p = np.broadcast_arrays(k, n, p)
+	inner = (k > 0) & (k < n)
+	k_in, n_in = np.where(inner, k, 1.), np.where(inner, n, 2.)
+	log_probs = log_probs_n - stirlerr(k_in) - stirlerr(n_in - k_in) - bd0(k_in, n_in * p) - bd0(n_in - k_in, n_in * (1 - p))
+	log_probs -= 0.5 * np.log(k_in * (n_in - k_in))
+
+	# log1p keeps the precision of log(1 - p) for small p
+	with np.errstate(divide = "ignore"):
+		log_q = np.log1p(- p)
+	at_zero = np.where(n == 0, 0., n * log_q)
+
+	return np.where(k == 0, at_zero, np.where(k == n, xlogy(n, p), log_probs))[()]
+
+
+def poisson_logpmf(k, _lambda):
+	"""
+	Computes the logarithm of the Poisson(lambda) probability of every k, with Loader's saddle point form (Loader, 2000):
+	- stirlerr(k) - bd0(k, lambda) - log(2 pi k) / 2, and - lambda at k = 0.
+	Unlike k log(lambda) - lambda - log(k!), whose terms cancel losing about lambda eps of precision, it is accurate for any lambda.
+
+	Arguments
+	------------
+	k: float or array-like
+		Non negative integers.
+	_lambda: float or array-like
+		Positive values.
+
+	Returns
+	------------
+	float or np.ndarray
+		Broadcasted shape of k and lambda
+
+	"""
+	k, _lambda = np.broadcast_arrays(np.asarray(k, dtype = float), np.asarray(_lambda, dtype = float))
+
+	# k = 0 is evaluated at k = 1 meanwhile
+	k_pos = np.where(k > 0, k, 1.)
+	log_probs = - stirlerr(k_pos) - bd0(k_pos, _lambda) - 0.5 * np.log(2 * pi * k_pos)
+
+	return np.where(k > 0, log_probs, - _lambda)[()]
+
+
+def xlogy(x, y):
+	"""
+	Computes x * log(y) for every element, using the convention 0 * log(0) = 0.
+
+	Arguments
+	------------
+	x: float or array-like
+	y: float or array-like
+		Non negative values.
+
+	Returns
+	------------
+	float or np.ndarray
+		Broadcasted shape of x and y
+
+	"""
+	x, y = np.asarray(x, dtype = float), np.asarray(y, dtype = float)
+	with np.errstate(divide = "ignore", invalid = "ignore"):
+		res = x * np.log(y)
+	return np.where(x == 0, 0., res)[()]
@@ -0,0 +1,52 @@
+
+
+import numpy as np
+
+from FiniteDiscrete import FiniteDiscrete
+from Binomial import Binomial
+from Poisson import Poisson
+from auxs import AliasTable, BinaryTree
+
+SUPPORT_SIZES = [10, 10**2, 10**3, 10**4, 10**5, 10**6]
+
+
+class FiniteDiscreteConstruction: 
+	params = [["tree", "alias"], SUPPORT_SIZES]
+	param_names = ["sampler", "n_atoms"]
+
+	def setup(self, sampler, n_atoms): 
+		self.values = np.arange(n_atoms, dtype = float)
+		self.weights = np.random.default_rng(0).random(n_atoms)
+		self.as_dict = dict(zip(self.values.tolist(), self.weights.tolist()))
+
+	def time_from_dict(self, sampler, n_atoms): 
+		FiniteDiscrete(self.as_dict, sampler = sampler)
+
+	def time_from_arrays(self, sampler, n_atoms): 
+		FiniteDiscrete.from_arrays(self.values, self.weights, sampler = sampler)
+
+
+class SamplerConstruction: 
+	params = SUPPORT_SIZES
+	param_names = ["n_atoms"]
+
+	def setup(self, n_atoms): 
+		self.values = np.arange(n_atoms, dtype = float)
+		self.weights = np.random.default_rng(0).random(n_atoms)
+
+	def time_binary_tree(self, n_atoms): 
+		BinaryTree.from_arrays(self.values.tolist(), self.weights.tolist())
+
+	def time_alias_table(self, n_atoms): 
+		AliasTable(self.values, self.weights)
+
+
+class DistributionConstruction: 
+	params = SUPPORT_SIZES
+	param_names = ["size"]
+
+	def time_binomial(self, size): 
+		Binomial(size, .3)
+
+	def time_poisson(self, size): 
+		Poisson(float(size))
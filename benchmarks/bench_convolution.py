@@ -0,0 +1,24 @@
+import numpy as np
+
+from FiniteDiscrete import FiniteDiscrete
+from convolution import convolve, convolve_power, convolve_probs
+
+SUPPORT_SIZES = [10, 10**3, 10**5]
+
+
+class LatticeConvolution: 
+	params = SUPPORT_SIZES
+	param_names = ["n_atoms"]
+
+	def setup(self, n_atoms): 
+		self.probs = np.random.default_rng(0).random(n_atoms)
+		self.distr = FiniteDiscrete.from_arrays(np.arange(n_atoms), self.probs, sampler = "inverse")
+
+	def time_convolve_probs(self, n_atoms): 
+		convolve_probs(self.probs, self.probs)
+
+	def time_convolve(self, n_atoms): 
+		convolve(self.distr, self.distr, sampler = "inverse")
+
+	def time_convolve_power_16(self, n_atoms): 
+		convolve_power(self.distr, 16, sampler = "inverse")
@@ -0,0 +1,44 @@
+
+
+import numpy as np
+
+from Binomial import Binomial
+from Poisson import Poisson
+
+EVAL_SIZES = [1, 10**3, 10**6]
+
+
+class BinomialPmf: 
+	params = [[10, 10**6], EVAL_SIZES]
+	param_names = ["n", "size"]
+
+	def setup(self, n, size): 
+		self.distr = Binomial(n, .3)
+		self.k = np.random.default_rng(0).integers(0, n + 1, size = size)
+
+	def time_pmf(self, n, size): 
+		self.distr.pmf(self.k)
+
+	def time_logpmf(self, n, size): 
+		self.distr.logpmf(self.k)
+
+	def time_probs_scalar(self, n, size): 
+		self.distr.probs(int(self.k[0]))
+
+
+class PoissonPmf: 
+	params = [[.5, 1e3, 1e5], EVAL_SIZES]
+	param_names = ["_lambda", "size"]
+
+	def setup(self, _lambda, size): 
+		self.distr = Poisson(_lambda)
+		self.k = np.random.default_rng(0).poisson(_lambda, size = size)
+
+	def time_pmf(self, _lambda, size): 
+		self.distr.pmf(self.k)
+
+	def time_logpmf(self, _lambda, size): 
+		self.distr.logpmf(self.k)
+
+	def time_probs_scalar(self, _lambda, size): 
+		self.distr.probs(int(self.k[0]))
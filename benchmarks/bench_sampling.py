@@ -0,0 +1,72 @@
+
+
+import numpy as np
+
+from FiniteDiscrete import FiniteDiscrete
+from Binomial import Binomial
+from Poisson import Poisson
+from Deterministic import Deterministic
+from Mixture import Mixture
+
+SAMPLE_SIZES = [1, 10**2, 10**4, 10**6, 10**8]
+
+
+class FiniteDiscreteSampling: 
+	params = [["tree", "alias"], [10**2, 10**5], SAMPLE_SIZES]
+	param_names = ["sampler", "n_atoms", "k"]
+
+	def setup(self, sampler, n_atoms, k): 
+		weights = np.random.default_rng(0).random(n_atoms)
+		self.distr = FiniteDiscrete.from_arrays(np.arange(n_atoms), weights, sampler = sampler)
+		self.rng = np.random.default_rng(1)
+
+	def time_get_samples(self, sampler, n_atoms, k): 
+		self.distr.get_samples(k, rng = self.rng)
+
+
+class BinomialSampling: 
+	params = [[10, 10**6], SAMPLE_SIZES]
+	param_names = ["n", "k"]
+
+	def setup(self, n, k): 
+		self.distr = Binomial(n, .3)
+		self.rng = np.random.default_rng(1)
+
+	def time_get_samples(self, n, k): 
+		self.distr.get_samples(k, rng = self.rng)
+
+
+class PoissonSampling: 
+	params = [[.5, 1e3, 1e5], SAMPLE_SIZES]
+	param_names = ["_lambda", "k"]
+
+	def setup(self, _lambda, k): 
+		self.distr = Poisson(_lambda)
+		self.rng = np.random.default_rng(1)
+
+	def time_get_samples(self, _lambda, k): 
+		self.distr.get_samples(k, rng = self.rng)
+
+
+class MixtureSampling: 
+	params = [[2, 100], SAMPLE_SIZES]
+	param_names = ["n_components", "k"]
+
+	def setup(self, n_components, k): 
+		components = [Binomial(10 + i, .3) if i % 2 else Poisson(1. + i) for i in range(n_components)]
+		self.distr = Mixture(components, np.random.default_rng(0).random(n_components))
+		self.rng = np.random.default_rng(1)
+
+	def time_get_samples(self, n_components, k): 
+		self.distr.get_samples(k, rng = self.rng)
+
+
+class DeterministicSampling: 
+	params = SAMPLE_SIZES
+	param_names = ["k"]
+
+	def setup(self, k): 
+		self.distr = Deterministic(1.)
+
+	def time_get_samples(self, k): 
+		self.distr.get_samples(k)
@@ -0,0 +1,75 @@
+
+
+import numpy as np
+
+from FiniteDiscrete import FiniteDiscrete
+from Binomial import Binomial
+from Poisson import Poisson
+from Deterministic import Deterministic
+from auxs import clear_memoized
+
+# Moments timed for every distribution, as (n, c)
+MOMENTS = [(1, 0), (2, 0), (3, 1.5), (4, 0)]
+
+
+class _StatsSuite: 
+	"""
+	Times get_moment and get_entropy, both on a fresh object (cold) and with memoized results (warm). 
+	Subclasses only define setup, creating self.distr. 
+	"""
+
+	def time_moments_cold(self, *params): 
+		for n, c in MOMENTS: 
+			clear_memoized(self.distr)
+			self.distr.get_moment(n, c)
+
+	def time_moments_warm(self, *params): 
+		for n, c in MOMENTS: 
+			self.distr.get_moment(n, c)
+
+	def time_entropy_cold(self, *params): 
+		clear_memoized(self.distr)
+		self.distr.get_entropy()
+
+	def time_entropy_warm(self, *params): 
+		self.distr.get_entropy()
+
+
+class FiniteDiscreteStats(_StatsSuite): 
+	params = [10, 10**3, 10**6]
+	param_names = ["n_atoms"]
+
+	def setup(self, n_atoms): 
+		weights = np.random.default_rng(0).random(n_atoms)
+		self.distr = FiniteDiscrete.from_arrays(np.arange(n_atoms), weights, sampler = "alias")
+
+
+class BinomialStats(_StatsSuite): 
+	params = [10, 10**3, 10**5]
+	param_names = ["n"]
+
+	def setup(self, n): 
+		self.distr = Binomial(n, .3)
+
+
+class PoissonStats(_StatsSuite): 
+	params = [.5, 1e3, 1e5]
+	param_names = ["_lambda"]
+
+	# Only n = 0, 1, 2 have closed forms
+	def time_moments_cold(self, _lambda): 
+		for n in (1, 2): 
+			clear_memoized(self.distr)
+			self.distr.get_moment(n, 0)
+
+	def time_moments_warm(self, _lambda): 
+		for n in (1, 2): 
+			self.distr.get_moment(n, 0)
+
+	def setup(self, _lambda): 
+		self.distr = Poisson(_lambda)
+
+
+class DeterministicStats(_StatsSuite): 
+	def setup(self): 
+		self.distr = Deterministic(1.)
@@ -0,0 +1,209 @@
+
+
+"""
+Runs the asv-style benchmarks of this folder, optionally saving and comparing baselines. 
+
+Every public class in a bench_*.py module is a benchmark suite: 
+	- params / param_names: lists of parameter values, every combination is timed
+	- setup(*params): called before timing each combination
+	- time_*(*params): the timed methods
+
+Usage
+------------
+	python -m benchmarks.run [--filter REGEX] [--max-size N] [--repeat R]
+		[--save baseline.json] [--compare baseline.json] [--threshold 0.2]
+
+"""
+
+import argparse, importlib, itertools, json, os, pkgutil, re, sys
+
+from timeit import default_timer
+
+# Benchmarks import the distributions as top level modules
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path: 
+	sys.path.insert(0, ROOT)
+
+# Each timing repeats the call until it takes at least this many seconds
+MIN_RUN_TIME = 0.05
+
+
+def get_suites(): 
+	"""
+	Finds every benchmark class in the bench_*.py modules of this folder. 
+
+	Returns
+	------------
+	list[tuple(str, type)]
+		Name and class of each suite
+	
+	"""
+	folder = os.path.dirname(os.path.abspath(__file__))
+	suites = []
+	for module_info in sorted(pkgutil.iter_modules([folder]), key = lambda m: m.name): 
+		if not module_info.name.startswith("bench_"): continue
+		module = importlib.import_module(f"benchmarks.{module_info.name}")
+		for name, obj in sorted(vars(module).items()): 
+			if name.startswith("_"): continue
+			if isinstance(obj, type) and obj.__module__ == module.__name__ and any(m.startswith("time_") for m in dir(obj)): 
+				suites.append((f"{module_info.name}.{name}", obj))
+	return suites
+
+
+def get_param_combinations(suite): 
+	"""
+	Lists every combination of the suite params, following asv conventions. 
+
+	Arguments
+	------------
+	suite: type
+		Benchmark class
+
+	Returns
+	------------
+	list[tuple]
+	
+	"""
+	params = getattr(suite, "params", None)
+	if params is None: 
+		return [()]
+	if not (isinstance(params, list) and len(params) > 0 and isinstance(params[0], list)): 
+		params = [params]
+	return list(itertools.product(*params))
+
+
+def time_call(func, params, repeat): 
+	"""
+	Times func(*params), returning the best time per call over repeat rounds. 
+
+	Arguments
+	------------
+	func: callable
+	params: tuple
+	repeat: int >= 1
+
+	Returns
+	------------
+	float
+		Seconds per call
+	
+	"""
+
+	# Calibrating how many calls are needed per round
+	start = default_timer()
+	func(*params)
+	elapsed = default_timer() - start
+	number = max(1, int(MIN_RUN_TIME / max(elapsed, 1e-9)))
+
+	best = elapsed
+	for _ in range(repeat if number > 1 else repeat - 1): 
+		start = default_timer()
+		for _ in range(number): 
+			func(*params)
+		best = min(best, (default_timer() - start) / number)
+	return best
+
+
+def run(filter_regex = None, max_size = None, repeat = 3): 
+	"""
+	Runs every benchmark, printing the times as they are measured. 
+
+	Arguments
+	------------
+	filter_regex: str or None
+		Only benchmarks whose name matches are run. 
+	max_size: int or None
+		Combinations with a numeric param above it are skipped. 
+	repeat: int >= 1
+		Rounds per benchmark, the best one is kept. 
+
+	Returns
+	------------
+	dict
+		From the benchmark name to its seconds per call. Failed benchmarks are left out. 
+	
+	"""
+	results = dict()
+	for suite_name, suite in get_suites(): 
+		methods = sorted(m for m in dir(suite) if m.startswith("time_"))
+		for params in get_param_combinations(suite): 
+			if max_size is not None and any(isinstance(p, (int, float)) and not isinstance(p, bool) and p > max_size for p in params): 
+				continue
+
+			names = [f"{suite_name}.{m}({', '.join(map(repr, params))})" for m in methods]
+			if filter_regex is not None: 
+				names = [name if re.search(filter_regex, name) else None for name in names]
+			if not any(names): continue
+
+			instance = suite()
+			if hasattr(instance, "setup"): 
+				instance.setup(*params)
+
+			for name, method in zip(names, methods): 
+				if name is None: continue
+				try: 
+					results[name] = time_call(getattr(instance, method), params, repeat)
+				except Exception as err: 
+					print(f"{'FAILED':>12}  {name}: {type(err).__name__}: {err}", flush = True)
+					continue
+				print(f"{results[name]:10.3e} s  {name}", flush = True)
+
+	return results
+
+
+def compare(results, baseline, threshold): 
+	"""
+	Compares the results with a baseline, printing the regressions. 
+
+	Arguments
+	------------
+	results: dict
+		From the benchmark name to its seconds per call
+	baseline: dict
+		Same format, from a previous run
+	threshold: float > 0
+		Relative slowdown above which a benchmark counts as a regression
+
+	Returns
+	------------
+	list[str]
+		Names of the regressed benchmarks
+	
+	"""
+	regressions = []
+	for name, seconds in results.items(): 
+		if name not in baseline: continue
+		ratio = seconds / baseline[name]
+		if ratio > 1 + threshold: 
+			regressions.append(name)
+			print(f"REGRESSION x{ratio:.2f}  {name}  ({baseline[name]:.3e} s -> {seconds:.3e} s)")
+	return regressions
+
+
+def main(argv = None): 
+	parser = argparse.ArgumentParser(description = "Runs the prob_distrs benchmarks")
+	parser.add_argument("--filter", default = None, help = "Only run benchmarks matching this regex")
+	parser.add_argument("--max-size", type = float, default = None, help = "Skip param combinations above this size")
+	parser.add_argument("--repeat", type = int, default = 3, help = "Rounds per benchmark, the best one is kept")
+	parser.add_argument("--save", default = None, help = "Store the results as a JSON baseline")
+	parser.add_argument("--compare", default = None, help = "JSON baseline to compare against")
+	parser.add_argument("--threshold", type = float, default = 0.2, help = "Relative slowdown flagged as a regression")
+	args = parser.parse_args(argv)
+
+	results = run(args.filter, args.max_size, args.repeat)
+
+	if args.save is not None: 
+		with open(args.save, "w") as f: 
+			json.dump(results, f, indent = 1, sort_keys = True)
+
+	if args.compare is not None: 
+		with open(args.compare) as f: 
+			baseline = json.load(f)
+		if compare(results, baseline, args.threshold): 
+			return 1
+
+	return 0
+
+
+if __name__ == "__main__": 
+	sys.exit(main())
@@ -0,0 +1,231 @@
+
+import numpy as np
+
+from Binomial import Binomial
+from Deterministic import Deterministic
+from FiniteDiscrete import FiniteDiscrete
+from Poisson import Poisson
+
+# Below this many output points np.convolve is used, above it FFT convolution
+FFT_SIZE = 512
+
+# FFT results below this fraction of the largest probability are rounding noise, and set to 0
+NOISE_FLOOR = 64 * np.finfo(float).eps
+
+
+def as_distr(X):
+	"""
+	Turns numbers into Deterministic distributions, so they can be added to random variables.
+
+	Arguments
+	------------
+	X: ProbDistr, int or float
+
+	Returns
+	------------
+	ProbDistr
+
+	"""
+	if isinstance(X, (int, float, np.integer, np.floating)):
+		return Deterministic(X)
+	return X
+
+
+def get_values_probs(X):
+	"""
+	Gets the values of a distribution with finite support, their probabilities, and a bound of the probability mass left out.
+	Deterministic ones are a single atom, and every other distribution goes through its to_finite,
+	windowed for Binomial ones to the values with a non-negligible probability, and truncated for Poisson ones.
+
+	Arguments
+	------------
+	X: ProbDistr
+
+	Returns
+	------------
+	tuple(np.ndarray, np.ndarray, float)
+
+	"""
+	if isinstance(X, Deterministic):
+		return np.array([X.value]), np.ones(1), 0.
+
+	try:
+		finite = X.to_finite()
+	except NotImplementedError:
+		raise TypeError(f"Convolution is not supported for {type(X).__name__} distributions")
+	return finite.values, finite.probabilities, finite.tail_bound
+
+
+def get_lattice_values_probs(X):
+	"""
+	Gets the values of a distribution with finite support on the integers, their probabilities, and a bound of the probability mass left out.
+
+	Arguments
+	------------
+	X: ProbDistr
+
+	Returns
+	------------
+	tuple(np.ndarray[int], np.ndarray, float)
+
+	"""
+	values, probs, tail_bound = get_values_probs(X)
+	if not (values == np.round(values)).all():
+		raise ValueError("Convolution requires supports on the integer lattice")
+	return values.astype(np.int64), np.asarray(probs, dtype = float), tail_bound
+
+
+def convolve_values_probs(values_x, probs_x, values_y, probs_y):
+	"""
+	Convolves two distributions on the integers, given as values and probabilities.
+	Supports spanning more integers than the number of pairs of atoms are combined pair by pair, in O(n m),
+	and dense ones are laid out on the lattice and convolved in O(N log N), N being the span.
+
+	Arguments
+	------------
+	values_x, values_y: np.ndarray[int]
+	probs_x, probs_y: np.ndarray
+
+	Returns
+	------------
+	tuple(np.ndarray[int], np.ndarray)
+		Sorted values of the sum, without repetitions, and their probabilities
+
+	"""
+	offset_x, offset_y = int(values_x.min()), int(values_y.min())
+	span = int(values_x.max()) - offset_x + int(values_y.max()) - offset_y + 1
+
+	if len(values_x) * len(values_y) <= span:
+		values, inverse = np.unique(np.add.outer(values_x, values_y).ravel(), return_inverse = True)
+		probs = np.bincount(inverse.ravel(), weights = np.multiply.outer(probs_x, probs_y).ravel(), minlength = len(values))
+		return values, probs
+
+	lattice_x = np.bincount(values_x - offset_x, weights = probs_x)
+	lattice_y = np.bincount(values_y - offset_y, weights = probs_y)
+	probs = convolve_probs(lattice_x, lattice_y)
+	values = offset_x + offset_y + np.arange(len(probs))
+	return values[probs > 0], probs[probs > 0]
+
+
+def convolve_probs(a, b):
+	"""
+	Convolves two arrays of probabilities: directly when small, with real FFTs in O(N log N) otherwise.
+
+	Arguments
+	------------
+	a, b: np.ndarray
+
+	Returns
+	------------
+	np.ndarray
+		Of length len(a) + len(b) - 1
+
+	"""
+	n = len(a) + len(b) - 1
+	if min(len(a), len(b)) == 1 or n <= FFT_SIZE:
+		return np.convolve(a, b)
+
+	size = 1 << (n - 1).bit_length()
+	probs = np.fft.irfft(np.fft.rfft(a, size) * np.fft.rfft(b, size), size)[:n]
+	probs[probs < NOISE_FLOOR * probs.max()] = 0.
+	return probs
+
+
+def convolve(X, Y, sampler = "inverse"):
+	"""
+	Computes the distribution of X + Y, for independent X and Y.
+	Closed forms are used when known, and otherwise FFT convolution over the integer lattice, or a pairwise one for sparse supports.
+	Other distributions are taken through their to_finite, so Poisson ones are truncated to all but a negligible mass.
+	The mass left out of the sum is at most the one left out of X plus the one left out of Y, kept as the tail_bound of the result.
+
+	Arguments
+	------------
+	X, Y: ProbDistr, int or float
+		Numbers are treated as Deterministic distributions.
+	sampler: str
+		Engine used by get_samples, if the result is a FiniteDiscrete. See FiniteDiscrete.__init__
+		Default value of "inverse", so no sampler is built for intermediate sums, like the ones of sum() or X + Y. Use "alias" for O(1) sampling.
+
+	Returns
+	------------
+	ProbDistr
+
+	"""
+	X, Y = as_distr(X), as_distr(Y)
+
+	# Closed forms
+	if isinstance(X, Deterministic) and isinstance(Y, Deterministic):
+		return Deterministic(X.value + Y.value)
+	if isinstance(X, Binomial) and isinstance(Y, Binomial) and X.p == Y.p:
+		return Binomial(X.n + Y.n, X.p)
+	if isinstance(X, Poisson) and isinstance(Y, Poisson):
+		return Poisson(X._lambda + Y._lambda)
+
+	# Adding a constant only shifts the support, which does not need to be on the lattice
+	if isinstance(Y, Deterministic):
+		X, Y = Y, X
+	if isinstance(X, Deterministic):
+
+		# Adding 0 keeps the distribution, so sum() starting at 0 keeps closed forms
+		if X.value == 0:
+			return Y
+		values, probs, tail_bound = get_values_probs(Y)
+		res = FiniteDiscrete.from_arrays(values + X.value, probs, sampler = sampler)
+		res.tail_bound = tail_bound
+		return res
+
+	values_x, probs_x, tail_x = get_lattice_values_probs(X)
+	values_y, probs_y, tail_y = get_lattice_values_probs(Y)
+	res = FiniteDiscrete.from_arrays(*convolve_values_probs(values_x, probs_x, values_y, probs_y), sampler = sampler)
+	res.tail_bound = min(tail_x + tail_y, 1.)
+	return res
+
+
+def convolve_power(X, n, sampler = "inverse"):
+	"""
+	Computes the distribution of the sum of n independent copies of X, with O(log n) convolutions by repeated squaring.
+	The mass left out of the sum is at most n times the one left out of X, kept as the tail_bound of the result.
+
+	Arguments
+	------------
+	X: ProbDistr
+	n: int >= 1
+		Number of copies.
+	sampler: str
+		Engine used by get_samples, if the result is a FiniteDiscrete. See FiniteDiscrete.__init__
+		Default value of "inverse", so no sampler is built for intermediate sums, like the ones of sum() or X + Y. Use "alias" for O(1) sampling.
+
+	Returns
+	------------
+	ProbDistr
+
+	"""
+	if not isinstance(n, int):
+		raise TypeError("n parameter has to be int")
+	assert n >= 1, "n parameter has to be at least 1"
+
+	X = as_distr(X)
+
+	# Closed forms
+	if isinstance(X, Deterministic):
+		return Deterministic(n * X.value)
+	if isinstance(X, Binomial):
+		return Binomial(n * X.n, X.p)
+	if isinstance(X, Poisson):
+		return Poisson(n * X._lambda)
+
+	# Squaring the base and multiplying it into the result, following the bits of n
+	values, probs, tail_bound = get_lattice_values_probs(X)
+	res_tail_bound = min(n * tail_bound, 1.)
+	res_values, res_probs = np.zeros(1, dtype = np.int64), np.ones(1)
+	while True:
+		if n & 1:
+			res_values, res_probs = convolve_values_probs(res_values, res_probs, values, probs)
+		n >>= 1
+		if n == 0:
+			break
+		values, probs = convolve_values_probs(values, probs, values, probs)
+
+	res = FiniteDiscrete.from_arrays(res_values, res_probs, sampler = sampler)
+	res.tail_bound = res_tail_bound
+	return res
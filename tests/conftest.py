@@ -0,0 +1,4 @@
+import os, sys
+
+# Distributions are top level modules of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
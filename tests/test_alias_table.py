@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from FiniteDiscrete import FiniteDiscrete
+from auxs import AliasTable
+
+
+@pytest.mark.parametrize("weights", [
+	[1., 1., 1., 1.],
+	[1., 2., 3., 4., 0., 10.],
+	np.random.default_rng(0).exponential(size = 200),
+	[1e-4, 1., 1e-4, 5., 1e-4],
+])
+def test_alias_frequencies_match_weights(weights):
+	weights = np.asarray(weights)
+	probs = weights / weights.sum()
+	n = 2 * 10**6
+	samples = AliasTable(np.arange(len(weights)), weights).get_samples(n, rng = 1)
+	counts = np.bincount(samples, minlength = len(weights))
+
+	# Every count within 5 standard deviations, and Pearson's chi-square within 6 of its own around its df
+	assert (np.abs(counts - n * probs) <= 5 * np.sqrt(n * probs * (1 - probs)) + 1e-9).all()
+	positive = probs > 0
+	chi2 = ((counts[positive] - n * probs[positive])**2 / (n * probs[positive])).sum()
+	df = positive.sum() - 1
+	assert chi2 <= df + 6 * np.sqrt(2 * df)
+
+
+def test_alias_tables_are_valid():
+	weights = np.random.default_rng(2).random(1000)
+	table = AliasTable(np.arange(1000), weights)
+	assert ((table.prob >= 0) & (table.prob <= 1)).all()
+
+	# Mass of each value: its own column share plus the columns aliasing it, each column being 1 / n
+	mass = table.prob + np.bincount(table.alias, weights = 1 - table.prob, minlength = 1000)
+	assert np.allclose(mass / 1000, weights / weights.sum())
+
+
+def test_finite_discrete_alias_sampler():
+	X = FiniteDiscrete({-1: 1, 3: 2, 7.5: 7}, sampler = "alias")
+	samples = X.get_samples(10**6, rng = 3)
+	values, counts = np.unique(samples, return_counts = True)
+	assert values.tolist() == [-1., 3., 7.5]
+	assert np.allclose(counts / 10**6, [.1, .2, .7], atol = 3e-3)
@@ -0,0 +1,36 @@
+import numpy as np
+
+from Binomial import Binomial
+from BinomialBatch import BinomialBatch
+from Poisson import Poisson
+from PoissonBatch import PoissonBatch
+from ProbDistr import ProbDistr
+
+
+def test_batches_broadcast_against_parameters():
+	X, Y = BinomialBatch([10, 20, 30], .3), PoissonBatch([1., 2., 3.])
+	k = np.arange(4).reshape(4, 1)
+	assert X.pmf(k).shape == Y.pmf(k).shape == (4, 3)
+	assert np.allclose(X.pmf(k)[:, 1], Binomial(20, .3).pmf(np.arange(4)))
+	assert np.allclose(Y.logpmf(k)[:, 2], Poisson(3.).logpmf(np.arange(4)))
+
+
+def test_batches_are_not_prob_distrs():
+	X = BinomialBatch([10, 20], [.3, .6])
+	assert not isinstance(X, ProbDistr)
+	assert isinstance(X[1], ProbDistr)
+	assert X[1].cdf(12) == Binomial(20, .6).cdf(12)
+
+
+def test_batch_parallel_samples():
+	X = PoissonBatch([1., 50.])
+	samples = X.get_samples(200, rng = 2, workers = 2)
+	assert samples.shape == (200, 2)
+	assert np.array_equal(samples, X.get_samples(200, rng = 2, workers = 2))
+
+
+def test_batch_iter_samples():
+	for X in (BinomialBatch([10, 20, 30], .3), PoissonBatch([1., 2., 3.])):
+		chunks = list(X.iter_samples(250, chunk_size = 100, rng = 4))
+		assert [chunk.shape for chunk in chunks] == [(100, 3), (100, 3), (50, 3)]
+		assert np.array_equal(np.concatenate(chunks), np.concatenate(list(X.iter_samples(250, chunk_size = 100, rng = 4))))
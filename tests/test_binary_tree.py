@@ -0,0 +1,70 @@
+import heapq
+
+import numpy as np
+import pytest
+
+from auxs import BinaryTree
+
+
+def get_nodes(tree):
+	# Every node of the tree, with its depth
+	nodes, stack = [], [(tree.root, 0)]
+	while stack:
+		node, depth = stack.pop()
+		nodes.append((node, depth))
+		if node.value is None:
+			stack.extend([(node.left, depth + 1), (node.right, depth + 1)])
+	return nodes
+
+
+def huffman_cost(weights):
+	# Weighted path length of an optimal prefix code, merging with a heap
+	heap = list(weights)
+	heapq.heapify(heap)
+	cost = 0.
+	while len(heap) > 1:
+		merged = heapq.heappop(heap) + heapq.heappop(heap)
+		cost += merged
+		heapq.heappush(heap, merged)
+	return cost
+
+
+@pytest.mark.parametrize("weights", [[1., 2.], [5., 1., 1., 1., 1., 1.], [1., 1., 1., 1.], np.random.default_rng(0).exponential(size = 300).tolist()])
+def test_huffman_structure(weights):
+	values = list(range(len(weights)))
+	tree = BinaryTree.from_arrays(values, weights)
+	nodes = get_nodes(tree)
+
+	leaves = {node.value: (node.weight, depth) for node, depth in nodes if node.value is not None}
+	assert sorted(leaves) == values
+	assert all(leaves[value][0] == weight for value, weight in zip(values, weights))
+
+	for node, _ in nodes:
+		if node.value is None:
+			assert node.weight == pytest.approx(node.left.weight + node.right.weight)
+			assert node.left.weight >= node.right.weight
+
+	# Huffman merging gives the smallest weighted depth of the leaves
+	assert sum(weight * depth for weight, depth in leaves.values()) == pytest.approx(huffman_cost(weights))
+
+
+def test_single_and_empty_trees():
+	tree = BinaryTree.from_arrays([7.], [3.])
+	assert (tree.root.value, tree.root.weight) == (7., 3.)
+	assert tree.get_samples(5, rng = 0).tolist() == [7.] * 5
+	assert BinaryTree.from_arrays([], []).root is None
+
+
+@pytest.mark.parametrize("weights", [[1., 2., 3., 4., 0., 10.], np.random.default_rng(1).exponential(size = 200)])
+def test_tree_frequencies_match_weights(weights):
+	weights = np.asarray(weights)
+	probs = weights / weights.sum()
+	n = 2 * 10**6
+	samples = BinaryTree.from_arrays(np.arange(len(weights)), weights).get_samples(n, rng = 1)
+	counts = np.bincount(samples, minlength = len(weights))
+
+	assert (np.abs(counts - n * probs) <= 5 * np.sqrt(n * probs * (1 - probs)) + 1e-9).all()
+	positive = probs > 0
+	chi2 = ((counts[positive] - n * probs[positive])**2 / (n * probs[positive])).sum()
+	df = positive.sum() - 1
+	assert chi2 <= df + 6 * np.sqrt(2 * df)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from FiniteDiscrete import FiniteDiscrete
+
+
+def get_distr(sampler = "tree"):
+	# Cumulative probabilities .1, .5, .7 and 1
+	return FiniteDiscrete({4: 2, 1: 1, 10: 3, 2.5: 4}, sampler = sampler)
+
+
+def test_cdf_and_sf():
+	X = get_distr()
+	x = np.array([-5, 1, 2, 2.5, 3, 4, 9.99, 10, 1e9])
+	expected = np.array([0, .1, .1, .5, .5, .7, .7, 1, 1])
+	assert np.allclose(X.cdf(x), expected)
+	assert np.allclose(X.sf(x), 1 - expected)
+	assert X.cdf(10) == 1. and X.sf(10) == 0.
+	assert X.cdf(.5) == 0. and X.sf(.5) == 1.
+	assert X.cdf(x.reshape(3, 3)).shape == (3, 3)
+	assert isinstance(X.cdf(3), float)
+
+
+def test_ppf():
+	X = get_distr()
+	assert X.ppf(0.) == 1.
+	assert X.ppf(1.) == 10.
+	assert X.ppf([.05, .1, .3, .6, .99]).tolist() == [1., 1., 2.5, 4., 10.]
+
+	# At an exact cumulative probability the quantile is that value, and just above it the next one
+	for value, cum_prob in zip(X.values, X.cum_probs):
+		assert X.ppf(cum_prob) == value
+	for value, cum_prob in zip(X.values[1:], X.cum_probs[:-1]):
+		assert X.ppf(np.nextafter(cum_prob, 1)) == value
+
+	with pytest.raises(AssertionError):
+		X.ppf(1.5)
+	with pytest.raises(AssertionError):
+		X.ppf(-.1)
+
+
+def test_ppf_inverts_cdf():
+	X = FiniteDiscrete.from_arrays(np.arange(0, 300, 3), np.random.default_rng(0).random(100))
+	assert np.array_equal(X.ppf(X.cdf(X.values)), X.values)
+	assert (X.cdf(X.ppf(np.linspace(0, 1, 1001))) >= np.linspace(0, 1, 1001) - 1e-12).all()
+
+
+@pytest.mark.parametrize("sampler", ["tree", "alias", "inverse"])
+def test_median_is_smallest_value_reaching_half(sampler):
+	# P(X <= 2.5) is exactly 1/2, so the median is 2.5, not the midpoint with 4
+	assert get_distr(sampler).get_median() == 2.5
+	assert FiniteDiscrete([1, 2, 3, 4]).get_median() == 2.
+	assert FiniteDiscrete({0: 1, 1: 2}).get_median() == 1.
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from Binomial import Binomial
+from Deterministic import Deterministic
+from FiniteDiscrete import FiniteDiscrete
+from Poisson import Poisson
+from convolution import convolve_power
+
+
+def test_sum_of_binomials_keeps_closed_form():
+	total = sum([Binomial(3, .5), Binomial(2, .5), Binomial(4, .5)])
+	assert isinstance(total, Binomial)
+	assert (total.n, total.p) == (9, .5)
+
+
+def test_sum_of_poissons_keeps_closed_form():
+	total = sum([Poisson(1.), Poisson(2.)])
+	assert isinstance(total, Poisson)
+	assert total._lambda == 3.
+
+
+def test_adding_zero_returns_the_distribution():
+	distr = FiniteDiscrete([1, 2])
+	assert distr + 0 is distr
+	assert 0 + distr is distr
+
+
+def test_binomials_with_different_p_match_their_moments():
+	total = Binomial(30, .2) + Binomial(40, .7)
+	assert isinstance(total, FiniteDiscrete)
+	assert np.isclose(total.get_mean(), 30 * .2 + 40 * .7)
+	assert np.isclose(total.get_var(), 30 * .2 * .8 + 40 * .7 * .3)
+
+
+def test_fft_convolution_matches_binomial_pmf():
+	# Bernoulli(p) added to itself n times, large enough to go through the FFT path
+	n, p = 1000, .3
+	total = convolve_power(FiniteDiscrete({0: 1 - p, 1: p}), n)
+	k = total.values
+	assert np.allclose(total.probabilities, Binomial(n, p).pmf(k), rtol = 0, atol = 1e-12)
+	assert np.isclose(total.probabilities.sum(), 1.)
+
+
+def test_convolve_power_matches_repeated_convolve():
+	distr = FiniteDiscrete({-1: 1, 0: 2, 3: 1})
+	power = convolve_power(distr, 5)
+	repeated = distr + distr + distr + distr + distr
+	assert np.array_equal(power.values, repeated.values)
+	assert np.allclose(power.probabilities, repeated.probabilities)
+
+
+def test_deterministic_shift():
+	shifted = FiniteDiscrete({0: 1, 2: 3}) + Deterministic(.5)
+	assert np.array_equal(shifted.values, [.5, 2.5])
+	assert np.allclose(shifted.probabilities, [.25, .75])
+
+
+def test_poisson_plus_finite_is_truncated():
+	total = Poisson(3.) + Binomial(10, .2)
+	assert np.isclose(total.get_mean(), 5.)
+	assert np.isclose(total.get_var(), 4.6)
+
+
+def test_non_lattice_support_raises():
+	with pytest.raises(ValueError):
+		FiniteDiscrete([.5, 1.]) + FiniteDiscrete([0, 1])
+
+
+def test_sparse_support_does_not_allocate_the_span():
+	distr = FiniteDiscrete({0: 1, 10**12: 1})
+	total = distr + distr
+	assert np.array_equal(total.values, [0, 10**12, 2 * 10**12])
+	assert np.allclose(total.probabilities, [.25, .5, .25])
+
+
+def test_sparse_and_dense_paths_agree():
+	rng = np.random.default_rng(0)
+	values = np.unique(rng.integers(0, 50, size = 20))
+	dense = FiniteDiscrete.from_arrays(values, rng.random(len(values)))
+	sparse = FiniteDiscrete.from_arrays(values * 1000, dense.probabilities)
+	dense_sum, sparse_sum = dense + dense, sparse + sparse
+	assert np.array_equal(dense_sum.values * 1000, sparse_sum.values)
+	assert np.allclose(dense_sum.probabilities, sparse_sum.probabilities)
+
+
+def test_large_binomials_use_their_window():
+	total = Binomial(10**7, .3) + Binomial(10**7, .5)
+	assert len(total.values) < 10**6
+	assert np.isclose(total.get_mean(), 8 * 10**6)
+	assert np.isclose(total.get_var(), 10**7 * (.21 + .25))
+
+
+def test_sums_build_no_sampler():
+	X = FiniteDiscrete.from_arrays(np.arange(1000), np.random.default_rng(0).random(1000))
+	total = sum([X] * 5)
+	assert total.sampler == "inverse"
+	assert not hasattr(total, "tree_repr")
+	assert convolve_power(X, 3, sampler = "alias").sampler == "alias"
@@ -0,0 +1,13 @@
+import numpy as np
+
+from DynamicFiniteDiscrete import DynamicFiniteDiscrete
+from FiniteDiscrete import FiniteDiscrete
+
+
+def test_repeated_list_values_add_up_like_finite_discrete():
+	dynamic, static = DynamicFiniteDiscrete([1, 1, 2]), FiniteDiscrete([1, 1, 2])
+	values, probs = dynamic.get_values_probs()
+	order = np.argsort(values)
+	assert np.array_equal(values[order], static.values)
+	assert np.allclose(probs[order], static.probabilities)
+	assert np.isclose(dynamic.get_mean(), static.get_mean())
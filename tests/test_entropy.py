@@ -0,0 +1,53 @@
+import pytest
+
+import Binomial as binomial_module
+import Poisson as poisson_module
+from Binomial import Binomial
+from Poisson import Poisson
+
+mpmath = pytest.importorskip("mpmath")
+
+
+def reference_entropy(log_pmf, mean, std, upper = None):
+	"""
+	Sums -p log p with 30 digits over mean +- (15 std + 30), beyond which probabilities are below 1e-40.
+	"""
+	mpmath.mp.dps = 30
+	lo = max(0, int(mean - 15 * std - 30))
+	hi = int(mean + 15 * std + 30) if upper is None else min(upper, int(mean + 15 * std + 30))
+	entropy = mpmath.mpf(0)
+	for k in range(lo, hi + 1):
+		log_prob = log_pmf(mpmath.mpf(k))
+		entropy -= mpmath.exp(log_prob) * log_prob
+	return float(entropy)
+
+
+def binomial_entropy(n, p):
+	p = mpmath.mpf(p)
+	log_pmf = lambda k: mpmath.loggamma(n + 1) - mpmath.loggamma(k + 1) - mpmath.loggamma(n - k + 1) + k * mpmath.log(p) + (n - k) * mpmath.log(1 - p)
+	return reference_entropy(log_pmf, float(n * p), float(n * p * (1 - p))**.5, upper = n)
+
+
+def poisson_entropy(_lambda):
+	_lambda = mpmath.mpf(_lambda)
+	log_pmf = lambda k: k * mpmath.log(_lambda) - _lambda - mpmath.loggamma(k + 1)
+	return reference_entropy(log_pmf, float(_lambda), float(_lambda)**.5)
+
+
+@pytest.mark.parametrize("n, p", [(1, .5), (10, .3), (1000, .01), (10**5, .999), (399996, .5), (400000, .5), (10**7, .02)])
+def test_binomial_entropy(n, p):
+	# 399996 and 400000 with p = 1/2 are just below and at ASYMPTOTIC_VAR
+	assert binomial_module.ASYMPTOTIC_VAR == 1e5
+	assert Binomial(n, p).get_entropy() == pytest.approx(binomial_entropy(n, p), rel = 1e-11, abs = 1e-12)
+
+
+def test_binomial_degenerate_entropy():
+	assert Binomial(10, 0.).get_entropy() == 0.
+	assert Binomial(10, 1.).get_entropy() == 0.
+
+
+@pytest.mark.parametrize("_lambda", [1e-3, .5, 7., 120., 999.9, 1000., 2e4])
+def test_poisson_entropy(_lambda):
+	# 999.9 and 1000 are just below and at ASYMPTOTIC_LAMBDA
+	assert poisson_module.ASYMPTOTIC_LAMBDA == 1e3
+	assert Poisson(_lambda).get_entropy() == pytest.approx(poisson_entropy(_lambda), rel = 1e-11, abs = 1e-12)
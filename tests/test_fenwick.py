@@ -0,0 +1,59 @@
+
+import numpy as np
+import pytest
+
+from DynamicFiniteDiscrete import DynamicFiniteDiscrete
+from auxs import FenwickTree
+
+
+def test_search_skips_zero_weights():
+	tree = FenwickTree([1., 2., 3., 4.])
+	tree.set_weight(1, 0.)
+	assert tree.get_total() == 8.
+	assert tree.search([0., 0.999, 1., 3.999, 4., 7.999]).tolist() == [0, 0, 2, 2, 3, 3]
+
+
+def test_sampling_after_remove():
+	X = DynamicFiniteDiscrete({1: 1., 2: 5., 3: 2., 4: 2.})
+	X.remove(2)
+	X.add(5, 4.)
+	X.remove(1)
+	samples = X.get_samples(100000, rng = 0)
+	values, counts = np.unique(samples, return_counts = True)
+	assert values.tolist() == [3., 4., 5.]
+	assert np.allclose(counts / len(samples), [.25, .25, .5], atol = 0.01)
+
+
+def test_remove_every_value_then_add():
+	X = DynamicFiniteDiscrete([1, 2, 3])
+	for value in (1, 2, 3):
+		X.remove(value)
+	X.add(7, 1.)
+	assert X.get_samples(10, rng = 0).tolist() == [7.] * 10
+
+
+def test_sampling_never_returns_removed_values():
+	# Rounding can take u = nextafter(total, 0) past the last positive weight, or onto the residue of a removed one
+	for seed in range(2000):
+		rng = np.random.default_rng(seed)
+		X = DynamicFiniteDiscrete({float(i): w for i, w in enumerate(rng.random(rng.integers(1, 20)))})
+		X.add(1000., .1)
+		X.remove(1000.)
+		total = X.tree.get_total()
+		pos = X.tree.search([0., np.nextafter(total, 0), total])
+		assert (X.tree.weights[pos] > 0).all()
+		assert 1000. not in X.slot_values[pos]
+
+
+def test_remove_clears_slot_value():
+	X = DynamicFiniteDiscrete({1: 1., 2: 1.})
+	X.remove(2)
+	assert np.isnan(X.slot_values).sum() == 1
+	assert X.get_samples(100, rng = 0).tolist() == [1.] * 100
+
+
+def test_empty_distribution_raises():
+	X = DynamicFiniteDiscrete()
+	for method in (X.get_mean, X.get_var, X.get_entropy, X.get_mode, lambda: X.get_samples(1)):
+		with pytest.raises(AssertionError):
+			method()
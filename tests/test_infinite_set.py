@@ -0,0 +1,73 @@
+
+import numpy as np
+
+from auxs import InfiniteSet, Interval
+
+
+def test_merge_sweeps_chains_of_overlaps():
+	intervals = [Interval(5, 6), Interval(0, 1), Interval(0.5, 10), Interval(12, 13)]
+	assert InfiniteSet(intervals).intervals == (Interval(0, 10), Interval(12, 13))
+
+
+def test_merge_keeps_kinds_apart():
+	intervals = [Interval(0, 2), Interval(1, 3, integer = True), Interval(4, 6, integer = True), Interval(8, 9, integer = True)]
+	assert InfiniteSet(intervals).intervals == (Interval(0, 2), Interval(1, 6, integer = True), Interval(8, 9, integer = True))
+
+
+def test_merge_many_intervals():
+	intervals = [Interval(i, i + 1, closed = (True, False)) for i in np.random.default_rng(0).permutation(2000).tolist()]
+	assert InfiniteSet(intervals).intervals == (Interval(0, 2000, closed = (True, False)), )
+
+
+def test_merge_real_bounds():
+	assert InfiniteSet([Interval(0, 1, closed = (True, False)), Interval(1, 2)]).intervals == (Interval(0, 2), )
+	assert len(InfiniteSet([Interval(0, 1, closed = (True, False)), Interval(1, 2, closed = (False, True))]).intervals) == 2
+	assert InfiniteSet([Interval(0, 1, closed = (False, False)), Interval(0, 1)]).intervals == (Interval(0, 1), )
+
+
+def test_merge_drops_empty():
+	assert InfiniteSet([Interval(1, 1, closed = (True, False)), Interval(0.2, 0.8, integer = True)]).intervals == ()
+
+
+def test_intersect_bounds():
+	assert Interval(0, 1).intersect(Interval(0, 1, closed = (False, False))) == Interval(0, 1, closed = (False, False))
+	assert Interval(0, 2).intersect(Interval(1, 3, closed = (False, True))) == Interval(1, 2, closed = (False, True))
+	assert Interval(0, 1, closed = (True, False)).intersect(Interval(1, 2)).is_empty()
+	assert Interval(0, 1).intersect(Interval(1, 2)) == Interval(1, 1)
+
+
+def test_intersect_integer_and_real():
+	assert Interval(0.5, 3.5).intersect(Interval(0, 5, integer = True)) == Interval(1, 3, integer = True)
+	assert Interval(0, 1, closed = (False, False)).intersect(Interval(0, 1, integer = True)).is_empty()
+	assert (InfiniteSet("N") & InfiniteSet([Interval(-2.5, 2.5)])).intervals == (Interval(0, 2, integer = True), )
+
+
+def test_contains_many_agrees_with_contains():
+	base = InfiniteSet([Interval(-3, 2, closed = (False, True)), Interval(4, 8, integer = True)], exceptions_set = [0, 5])
+	sets = [
+		base,
+		base | InfiniteSet([Interval(1.5, 3.5)]),
+		base & InfiniteSet("Z"),
+		base & (InfiniteSet("R") - [1.5]),
+		base - InfiniteSet([Interval(-1, 0.5)]),
+		InfiniteSet("N+") | InfiniteSet("N-"),
+		InfiniteSet("NN", exceptions_set = InfiniteSet([Interval(-10, -5, integer = True)])),
+	]
+	values = np.concatenate([np.arange(-12, 12, 0.5), [np.nan, np.inf, -np.inf, 1e300]])
+	for s in sets:
+		assert np.array_equal(s.contains_many(values), [value in s for value in values])
+		assert s.contains_many(values.reshape(4, -1)).shape == (4, len(values) // 4)
+
+
+def test_membership_with_many_intervals():
+	# Integer and real intervals are disjoint within their kind, but may overlap each other
+	rng = np.random.default_rng(1)
+	lowers = rng.uniform(-100, 100, size = 300).round(1)
+	intervals = [Interval(lower, lower + width, integer = bool(integer), closed = tuple(closed))
+		for lower, width, integer, closed in zip(lowers, rng.exponential(2, size = 300).round(1), rng.integers(0, 2, size = 300), rng.integers(0, 2, size = (300, 2)) == 1)]
+	s = InfiniteSet(intervals)
+	values = np.concatenate([np.arange(-110, 110, 0.1).round(1), lowers, [np.nan, np.inf]])
+	expected = [any(value in interval for interval in intervals) for value in values]
+	assert np.array_equal(s.contains_many(values), expected)
+	assert [value in s for value in values] == expected
+	assert s.contains_many(3.) == (3. in s)
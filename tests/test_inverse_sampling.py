@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from FiniteDiscrete import FiniteDiscrete
+
+
+def uniform(m, sampler = "tree"):
+	# Value i is drawn exactly when the uniform is in [i/m, (i+1)/m)
+	return FiniteDiscrete.from_arrays(np.arange(m), np.ones(m), sampler = sampler)
+
+
+@pytest.mark.parametrize("sampler", ["tree", "alias", "inverse"])
+def test_stratified_draws_one_uniform_per_stratum(sampler):
+	samples = uniform(1000, sampler).get_samples(1000, rng = 0, stratified = True)
+	assert np.array_equal(np.sort(samples), np.arange(1000))
+
+
+def test_antithetic_pairs_sum_to_one():
+	# u and 1-u fall in mirrored values, i and m-1-i
+	m = 64
+	samples = uniform(m).get_samples(10000, rng = 1, antithetic = True)
+	counts = np.bincount(samples.astype(int), minlength = m)
+	assert np.array_equal(counts, counts[::-1])
+
+
+def test_antithetic_odd_k_drops_one_uniform():
+	m = 64
+	samples = uniform(m).get_samples(10001, rng = 2, antithetic = True)
+	assert len(samples) == 10001
+	counts = np.bincount(samples.astype(int), minlength = m)
+	assert np.abs(counts - counts[::-1]).sum() == 2
+
+
+def test_stratified_antithetic_strata_and_pairs():
+	# The first half of the pairs is stratified, so every value is drawn once by u and once by 1-u
+	samples = uniform(500).get_samples(1000, rng = 3, stratified = True, antithetic = True)
+	assert np.array_equal(np.bincount(samples.astype(int)), np.full(500, 2))
+
+	samples = uniform(500).get_samples(999, rng = 3, stratified = True, antithetic = True)
+	counts = np.bincount(samples.astype(int), minlength = 500)
+	assert counts.sum() == 999 and set(counts.tolist()) <= {1, 2}
+
+
+def test_shuffled_prefix_is_not_sorted():
+	samples = uniform(1000).get_samples(1000, rng = 4, stratified = True)
+	assert not np.array_equal(samples, np.sort(samples))
+
+
+@pytest.mark.parametrize("options", [dict(stratified = True), dict(antithetic = True), dict(stratified = True, antithetic = True)])
+def test_inverse_options_write_into_out(options):
+	X = FiniteDiscrete({1: 1, 2: 3, 5: 2})
+	out = np.zeros(101)
+	res = X.get_samples(101, rng = 5, out = out, **options)
+	assert res is out
+	assert np.array_equal(out, X.get_samples(101, rng = 5, **options))
+	assert set(np.unique(out)) <= {1., 2., 5.}
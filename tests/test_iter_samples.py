@@ -0,0 +1,47 @@
+from itertools import islice
+
+import numpy as np
+import pytest
+
+from FiniteDiscrete import FiniteDiscrete
+from Poisson import Poisson
+from auxs.sampling import DEFAULT_CHUNK_SIZE, iter_sample_chunks
+
+
+def test_chunk_sizes_and_short_last_chunk():
+	chunks = list(Poisson(3.).iter_samples(1050, chunk_size = 200, rng = 0))
+	assert [len(chunk) for chunk in chunks] == [200] * 5 + [50]
+	assert [len(chunk) for chunk in Poisson(3.).iter_samples(400, chunk_size = 200, rng = 0)] == [200, 200]
+	assert [len(chunk) for chunk in Poisson(3.).iter_samples(10, rng = 0)] == [10]
+	assert [len(chunk) for chunk in Poisson(3.).iter_samples(DEFAULT_CHUNK_SIZE + 1, rng = 0)] == [DEFAULT_CHUNK_SIZE, 1]
+
+
+def test_zero_samples():
+	assert list(Poisson(3.).iter_samples(0, rng = 0)) == []
+
+
+def test_endless_stream():
+	stream = FiniteDiscrete([1, 2, 3]).iter_samples(chunk_size = 7, rng = 1)
+	chunks = list(islice(stream, 100))
+	assert len(chunks) == 100 and all(len(chunk) == 7 for chunk in chunks)
+	assert next(stream).shape == (7, )
+
+
+@pytest.mark.parametrize("sampler", ["tree", "alias", "inverse"])
+def test_chunks_are_reproducible(sampler):
+	X = FiniteDiscrete({1: 1, 2: 3, 5: 2}, sampler = sampler)
+	a = np.concatenate(list(X.iter_samples(1000, chunk_size = 128, rng = 3)))
+	b = np.concatenate(list(X.iter_samples(1000, chunk_size = 128, rng = 3)))
+	assert np.array_equal(a, b)
+	assert not np.array_equal(a, np.concatenate(list(X.iter_samples(1000, chunk_size = 128, rng = 4))))
+
+	# Every chunk continues the stream of the same Generator
+	rng = np.random.default_rng(3)
+	assert np.array_equal(a, np.concatenate([X.get_samples(size, rng = rng) for size in [128] * 7 + [104]]))
+
+
+def test_invalid_arguments():
+	with pytest.raises(AssertionError):
+		next(iter_sample_chunks(Poisson(3.).get_samples, -1))
+	with pytest.raises(AssertionError):
+		next(iter_sample_chunks(Poisson(3.).get_samples, 10, chunk_size = 0))
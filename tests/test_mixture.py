@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from Binomial import Binomial
+from Deterministic import Deterministic
+from FiniteDiscrete import FiniteDiscrete
+from Mixture import Mixture
+from Poisson import Poisson
+
+
+def get_mixture():
+	components = [Binomial(10, .3), Poisson(4.), FiniteDiscrete({20: 1, 21: 3})]
+	return Mixture(components, [2, 1, 1]), components, np.array([.5, .25, .25])
+
+
+def test_mixture_pmf_is_weighted_sum():
+	X, components, weights = get_mixture()
+	k = np.array([[-1, 0, 3], [10.5, 20, 21]])
+	expected = sum(w * comp.pmf(k) for w, comp in zip(weights, components))
+	assert X.pmf(k).shape == (2, 3)
+	assert np.allclose(X.pmf(k), expected)
+	assert X.pmf(3) == pytest.approx(float(expected[0, 2]))
+
+
+def test_mixture_logpmf():
+	X, components, weights = get_mixture()
+	k = np.array([0, 3, 20, 21, 200])
+	expected = np.log(sum(w * comp.pmf(k) for w, comp in zip(weights, components)))
+	assert np.allclose(X.logpmf(k), expected)
+
+	# Where every component is -inf, so is the mixture, with no warnings
+	with np.errstate(all = "raise"):
+		assert np.isneginf(X.logpmf([-1, 2.5, 15.5])).all()
+
+	# Far in the tails the pmf underflows, but the log-sum-exp does not
+	Y = Mixture([Poisson(1.), Poisson(2.)])
+	assert Y.logpmf(500) == pytest.approx(np.logaddexp(np.log(.5) + Poisson(1.).logpmf(500), np.log(.5) + Poisson(2.).logpmf(500)))
+
+
+def test_mixture_cdf_and_sf():
+	X, components, weights = get_mixture()
+	x = np.array([-1, 0, 2.5, 10, 19.9, 20, 21, 30])
+	expected = sum(w * comp.cdf(x) for w, comp in zip(weights, components))
+	assert np.allclose(X.cdf(x), expected)
+	assert np.allclose(X.sf(x), 1 - expected)
+	assert X.cdf(30) == pytest.approx(1.)
+
+
+def test_mixture_moments():
+	X, components, weights = get_mixture()
+	mean = weights @ [3., 4., 20.75]
+	assert X.get_mean() == pytest.approx(mean)
+	second = weights @ [2.1 + 9, 4 + 16, .75 * 441 + .25 * 400]
+	assert X.get_moment(2) == pytest.approx(second)
+	assert X.get_var() == pytest.approx(second - mean**2)
+	assert X.get_moment(1, c = 1.) == pytest.approx(mean - 1)
+
+
+def test_mixture_sampling_frequencies():
+	X = Mixture([Deterministic(0), Deterministic(1), FiniteDiscrete([2, 3])], [1, 2, 7])
+	n = 10**6
+	samples = X.get_samples(n, rng = 3)
+	probs = np.array([.1, .2, .35, .35])
+	counts = np.bincount(samples.astype(int), minlength = 4)
+	assert (np.abs(counts - n * probs) <= 5 * np.sqrt(n * probs * (1 - probs))).all()
+
+	# Samples are shuffled, not grouped by component
+	assert len(np.unique(samples[:100])) > 1
+	assert np.array_equal(samples, X.get_samples(n, rng = 3))
+	assert X.get_samples(0, rng = 0).shape == (0, )
@@ -0,0 +1,20 @@
+import numpy as np
+
+from Binomial import Binomial
+
+
+def test_binomial_moments_match_closed_forms():
+	for n, p in ((20, .3), (10**7, .3), (10**6, 1e-5)):
+		X = Binomial(n, p)
+		mean, var = n * p, n * p * (1 - p)
+		assert np.isclose(X.get_moment(0), 1.)
+		assert np.isclose(X.get_moment(1), mean)
+		assert np.isclose(X.get_moment(2, c = mean), var)
+		assert np.isclose(X.get_moment(3, c = mean), var * (1 - 2 * p))
+		assert np.isclose(X.get_moment(4, c = mean), 3 * var**2 + var * (1 - 6 * p * (1 - p)))
+
+
+def test_binomial_moment_does_not_build_the_support():
+	X = Binomial(10**9, .5)
+	assert np.isclose(X.get_moment(2, c = X.get_mean()), X.get_var())
+	assert X._support is None
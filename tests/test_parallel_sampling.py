@@ -0,0 +1,45 @@
+import multiprocessing, pickle
+
+import numpy as np
+
+from Binomial import Binomial
+from FiniteDiscrete import FiniteDiscrete
+from Mixture import Mixture
+from Poisson import Poisson
+
+
+def test_parallel_samples_reproducible():
+	X = Mixture([Binomial(10, .3), Poisson(4.)])
+	a, b = X.get_samples(1000, rng = 7, workers = 2), X.get_samples(1000, rng = 7, workers = 2)
+	assert a.shape == (1000, )
+	assert np.array_equal(a, b)
+
+
+def test_parallel_samples_into_out():
+	X = FiniteDiscrete([1, 2, 2, 5], sampler = "alias")
+	out = np.zeros(500)
+	res = X.get_samples(500, rng = 3, out = out, workers = 2)
+	assert res is out
+	assert np.array_equal(out, X.get_samples(500, rng = 3, workers = 2))
+	assert set(np.unique(out)) <= {1., 2., 5.}
+
+
+def test_parallel_samples_keyword_options():
+	X = FiniteDiscrete([1, 2, 3])
+	samples = X.get_samples(300, rng = 1, stratified = True, workers = 3)
+	assert set(np.unique(samples)) <= {1., 2., 3.}
+
+
+def test_parallel_samples_forkserver():
+	# Distributions are pickled to the workers, instead of inherited by fork
+	context = multiprocessing.get_context("forkserver")
+	X = Mixture([Binomial(10, .3), Poisson(4.), Poisson(30., cache_size = 8)])
+	a = X.get_samples(1000, rng = 7, workers = 2, mp_context = context)
+	assert np.array_equal(a, X.get_samples(1000, rng = 7, workers = 2))
+	assert Poisson(3.).get_samples(10, workers = 2, mp_context = context).shape == (10, )
+
+
+def test_pickle_rebuilds_probs():
+	for X in (Binomial(10, .3), Poisson(4.), Poisson(4., cache_size = 8)):
+		Y = pickle.loads(pickle.dumps(X))
+		assert Y.probs(3) == X.probs(3)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+import Poisson as poisson_module
+from Poisson import Poisson
+
+
+@pytest.mark.parametrize("_lambda", [.05, 3., 9.5, 10., 50., 1e4])
+def test_poisson_frequencies_match_pmf(_lambda):
+	# Lambdas below TABLE_LAMBDA invert a cumulative table, the others use rng.poisson
+	n = 10**6
+	samples = Poisson(_lambda).get_samples(n, rng = 1)
+	assert samples.dtype.kind == "i" and samples.min() >= 0
+
+	# Values with an expected count below 5 are pooled in the bins at both ends
+	sd = _lambda**.5
+	lo, hi = max(0, int(_lambda - 6 * sd)), int(_lambda + 6 * sd) + 5
+	probs = Poisson(_lambda).pmf(np.arange(lo, hi + 1))
+	keep = np.flatnonzero(n * probs >= 5)
+	first, last = lo + keep[0], lo + keep[-1]
+	probs = Poisson(_lambda).pmf(np.arange(first, last + 1))
+	probs[0] += Poisson(_lambda).cdf(first - 1) if first > 0 else 0.
+	probs[-1] = 1 - probs[:-1].sum()
+	counts = np.bincount(np.clip(samples, first, last) - first, minlength = len(probs))
+
+	assert (np.abs(counts - n * probs) <= 5 * np.sqrt(n * probs * (1 - probs))).all()
+	chi2 = ((counts - n * probs)**2 / (n * probs)).sum()
+	df = len(probs) - 1
+	assert chi2 <= df + 6 * np.sqrt(2 * max(df, 1))
+
+
+def test_poisson_branches():
+	assert poisson_module.TABLE_LAMBDA == 10
+	X = Poisson(3.)
+	X.get_samples(10, rng = 0)
+	assert X._cum_table is not None
+	Y = Poisson(10.)
+	Y.get_samples(10, rng = 0)
+	assert Y._cum_table is None
+
+
+@pytest.mark.parametrize("_lambda", [3., 50.])
+def test_poisson_samples_edge_cases(_lambda):
+	X = Poisson(_lambda)
+	assert X.get_samples(0, rng = 0).shape == (0, )
+	assert np.array_equal(X.get_samples(1000, rng = 5), X.get_samples(1000, rng = 5))
+	assert not np.array_equal(X.get_samples(1000, rng = 5), X.get_samples(1000, rng = 6))
+	rng = np.random.default_rng(7)
+	assert np.array_equal(np.concatenate([X.get_samples(500, rng = rng), X.get_samples(500, rng = rng)]), X.get_samples(1000, rng = 7))
+	with pytest.raises(TypeError):
+		X.get_samples(2.)
@@ -0,0 +1,26 @@
+
+import pickle
+
+import numpy as np
+import pytest
+
+from FiniteDiscrete import FiniteDiscrete
+
+
+@pytest.mark.parametrize("sampler", ["tree", "alias", "inverse"])
+@pytest.mark.parametrize("mmap", [True, False])
+def test_load_save_gives_same_samples(tmp_path, sampler, mmap):
+	X = FiniteDiscrete.from_arrays(np.arange(100.), np.random.default_rng(0).random(100), sampler = sampler)
+	X.save(str(tmp_path / "distr"))
+	Y = FiniteDiscrete.load(str(tmp_path / "distr"), mmap = mmap)
+
+	assert Y.sampler == sampler
+	assert np.array_equal(X.get_samples(1000, rng = 5), Y.get_samples(1000, rng = 5))
+	assert np.array_equal(X.cdf([10, 50.5]), Y.cdf([10, 50.5]))
+
+
+def test_mmap_pickles_as_path(tmp_path):
+	X = FiniteDiscrete([1, 2, 2, 3], sampler = "alias")
+	X.save(str(tmp_path / "distr"))
+	Y = pickle.loads(pickle.dumps(FiniteDiscrete.load(str(tmp_path / "distr"))))
+	assert np.array_equal(X.get_samples(100, rng = 1), Y.get_samples(100, rng = 1))
@@ -0,0 +1,88 @@
+import math
+
+import numpy as np
+import pytest
+
+from Binomial import Binomial
+from BinomialBatch import BinomialBatch
+from Poisson import Poisson
+from PoissonBatch import PoissonBatch
+from auxs.special import GAMMALN_BLOCK, gammaln, stirlerr, bd0, binom_logpmf, poisson_logpmf
+
+
+def test_gammaln_matches_lgamma():
+	x = np.concatenate([np.linspace(0.01, 30, 3001), np.geomspace(30, 1e15, 500)])
+	expected = np.array([math.lgamma(value) for value in x])
+	assert np.allclose(gammaln(x), expected, rtol = 1e-14, atol = 1e-14)
+	assert gammaln(5.) == pytest.approx(math.lgamma(5.), rel = 1e-15)
+
+
+def test_gammaln_blocks_agree():
+	# Above GAMMALN_BLOCK values the input is evaluated in blocks
+	x = np.random.default_rng(0).uniform(0.1, 1e6, size = 3 * GAMMALN_BLOCK + 7).reshape(-1, 1)
+	res = gammaln(x)
+	assert res.shape == x.shape
+	assert np.array_equal(res[:GAMMALN_BLOCK], gammaln(x[:GAMMALN_BLOCK]))
+	sample = np.random.default_rng(1).choice(len(x), size = 200)
+	assert np.allclose(res[sample, 0], [math.lgamma(value) for value in x[sample, 0]], rtol = 1e-14)
+
+
+def test_stirlerr_and_bd0():
+	x = np.arange(1, 40.)
+	expected = [math.lgamma(value + 1) - (value + .5) * math.log(value) + value - .5 * math.log(2 * math.pi) for value in x]
+	assert np.allclose(stirlerr(x), expected, rtol = 1e-11)
+	assert bd0(5., 5.) == 0.
+	assert bd0([3., 100.], 10.) == pytest.approx([3 * math.log(.3) + 7, 100 * math.log(10) - 90])
+	assert bd0(1e9 + 1, 1e9) == pytest.approx(.5e-9, rel = 1e-6)
+
+
+def test_binom_logpmf_large_n():
+	# Exact log-probabilities, with 40 digits
+	mpmath = pytest.importorskip("mpmath")
+	mpmath.mp.dps = 40
+	for n in (10**7, 10**9):
+		p = .3
+		k = np.round(n * p + np.array([-5, 0, 1, 5]) * (n * p * (1 - p))**.5)
+		expected = [float(mpmath.loggamma(n + 1) - mpmath.loggamma(j + 1) - mpmath.loggamma(n - j + 1)
+			+ j * mpmath.log(p) + (n - j) * mpmath.log(1 - mpmath.mpf(p))) for j in k.tolist()]
+		assert np.allclose(binom_logpmf(k, n, p), expected, rtol = 0, atol = 1e-10)
+
+
+def test_binomial_pmf_edge_cases():
+	k = [-1, 0, 1, 2.5, 9, 10, 11]
+	assert Binomial(10, 0.).pmf(k).tolist() == [0, 1, 0, 0, 0, 0, 0]
+	assert Binomial(10, 1.).pmf(k).tolist() == [0, 0, 0, 0, 0, 1, 0]
+	assert Binomial(0, .4).pmf(k).tolist() == [0, 1, 0, 0, 0, 0, 0]
+
+	logpmf = Binomial(10, .4).logpmf(k)
+	assert np.isneginf(logpmf[[0, 3, 6]]).all()
+	assert np.allclose(logpmf[[1, 2, 4, 5]], [math.log(math.comb(10, j) * .4**j * .6**(10 - j)) for j in (0, 1, 9, 10)])
+	assert np.isclose(Binomial(10, .4).pmf(np.arange(11)).sum(), 1.)
+	assert Binomial(10, .4).logpmf(3) == pytest.approx(math.log(math.comb(10, 3) * .4**3 * .6**7))
+
+
+def test_batch_logpmf_matches_binomial():
+	X = BinomialBatch([0, 1, 50, 10**8], [.5, 0., .2, 1e-7])
+	k = np.array([[0.], [1.], [10.], [2.5]])
+	expected = np.stack([Binomial(int(n), float(p)).logpmf(k[:, 0]) for n, p in zip(X.n, X.p)], axis = 1)
+	assert np.array_equal(X.logpmf(k), expected)
+
+
+def test_poisson_logpmf_large_lambda():
+	mpmath = pytest.importorskip("mpmath")
+	mpmath.mp.dps = 40
+	for _lambda in (1e9, 1e12):
+		k = np.round(_lambda + np.array([-5, 0, 1, 5]) * _lambda**.5)
+		expected = [float(j * mpmath.log(_lambda) - _lambda - mpmath.loggamma(j + 1)) for j in k.tolist()]
+		assert np.allclose(poisson_logpmf(k, _lambda), expected, rtol = 0, atol = 1e-10)
+
+
+def test_poisson_pmf_edge_cases():
+	X = Poisson(3.)
+	k = [-1, 0, 1.5, 2, 40]
+	logpmf = X.logpmf(k)
+	assert np.isneginf(logpmf[[0, 2]]).all()
+	assert np.allclose(logpmf[[1, 3, 4]], [-3., math.log(4.5 * math.exp(-3)), 40 * math.log(3) - 3 - math.lgamma(41)])
+	assert X.pmf(0) == pytest.approx(math.exp(-3.), rel = 1e-15)
+	assert np.isclose(X.pmf(np.arange(60)).sum(), 1.)
+	assert np.array_equal(PoissonBatch([3.]).logpmf(np.reshape(k, (-1, 1)))[:, 0], logpmf)
@@ -0,0 +1,63 @@
+import math
+
+import numpy as np
+
+from Binomial import Binomial
+from Deterministic import Deterministic
+from FiniteDiscrete import FiniteDiscrete
+from Mixture import Mixture
+from Poisson import Poisson
+from convolution import convolve_power
+
+
+def test_binomial_finite_is_windowed():
+	X = Binomial(10**7, .5)
+	finite = X.to_finite()
+	assert finite.sampler == "inverse"
+	assert len(finite.values) < 10**6
+	assert abs(X.cdf(5 * 10**6) - 0.5) < 1e-3
+	assert X.ppf(0.5) == 5 * 10**6
+
+
+def test_binomial_finite_small():
+	X = Binomial(10, .3)
+	assert np.array_equal(X.to_finite().values, np.arange(11))
+	assert np.allclose(X.cdf(np.arange(11)), np.cumsum(X.pmf(np.arange(11))))
+
+
+def test_poisson_finite_default_inverse():
+	assert Poisson(4.).to_finite().sampler == "inverse"
+
+
+def test_deterministic_finite_cached():
+	X = Deterministic(3)
+	assert X.to_finite() is X.to_finite()
+	assert X.to_finite().sampler == "inverse"
+	assert X.ppf(0.3) == 3
+
+
+def test_poisson_finite_tail_bound():
+	for _lambda in (.1, 4., 250., 1e5):
+		for tol in (1e-3, 1e-12):
+			X = Poisson(_lambda)
+			finite = X.to_finite(tol)
+			assert 0 < finite.tail_bound <= tol
+
+			# Mass outside the window, adding the pmf up to far in the upper tail
+			lo, hi = int(finite.values[0]), int(finite.values[-1])
+			outside = np.concatenate([np.arange(lo), np.arange(hi + 1, hi + 50 * int(_lambda**.5 + 10))])
+			assert math.fsum(X.pmf(outside)) <= finite.tail_bound
+
+
+def test_finite_discrete_has_no_tail():
+	assert FiniteDiscrete([1, 2]).tail_bound == 0.
+
+
+def test_tail_bound_propagates():
+	bound = Poisson(3.).to_finite().tail_bound
+	assert (Poisson(3.) + Binomial(10, .2)).tail_bound == bound
+	assert (Poisson(3.) + 2).tail_bound == bound
+	assert (Poisson(3.) + Poisson(4.).to_finite()).tail_bound == bound + Poisson(4.).to_finite().tail_bound
+	assert convolve_power(Poisson(3.).to_finite(), 4).tail_bound == 4 * bound
+	assert Mixture([Poisson(3.), Binomial(10, .2)], [3, 1]).to_finite().tail_bound == .75 * bound
+	assert (Binomial(10, .2) + Binomial(5, .5)).tail_bound == 0.